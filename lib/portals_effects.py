@@ -5,6 +5,8 @@ All confirmed effect and trigger syntax for the Portals Tasks system.
 Architecture:
 - Effector functions return the inner {"$type": "...", ...} payload
 - Trigger functions return the inner {"$type": "..."} payload
+- Zero-arg builders all go through _constant(), the single place to change
+  how fixed payloads are produced (see IMMUTABLE_RETURNS)
 - Wrapper functions assemble these into TaskEffectorSubscription / TaskTriggerSubscription
 - Helper functions attach tasks to logic dicts
 
@@ -27,8 +29,13 @@ Usage:
     add_task_to_logic(my_logic, task)
 """
 
-import uuid
-from typing import Dict, List, Optional
+import base64
+import functools
+import json
+import os
+from typing import Dict, List, Mapping, Optional
+
+from portals_utils import generate_uuid
 
 
 # ============================================================================
@@ -120,6 +127,55 @@ TRIGGER_TYPES = {
 }
 
 
+# ============================================================================
+# SHARED PAYLOADS
+# ============================================================================
+
+# When True, zero-arg builders (effector_show(), trigger_on_click(), ...)
+# return one shared read-only payload per $type instead of a fresh dict.
+# Saves an allocation per call in large generators, with one limitation:
+# callers must not mutate the result — item assignment, update(), pop()
+# and friends raise TypeError. Copy it first (dict(p), p.copy() or
+# copy.deepcopy(p) all give a plain mutable dict). The payloads are dict
+# subclasses, so json.dump/json.dumps and deepcopy work on room data that
+# holds them, with or without portals_utils.json_default.
+IMMUTABLE_RETURNS = False
+
+
+class _FrozenPayload(dict):
+    """A dict that rejects mutation; returned when IMMUTABLE_RETURNS is set."""
+
+    __slots__ = ()
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError(f"shared {self.get('$type')} payload is read-only; copy it first")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return dict(self)
+
+    def __reduce__(self):
+        return (_FrozenPayload, (dict(self),))
+
+
+_FROZEN_PAYLOADS: Dict[str, Mapping] = {}
+
+
+def _constant(type_name: str) -> Mapping:
+    """Payload for a builder that takes no arguments: {"$type": type_name}."""
+    if IMMUTABLE_RETURNS:
+        payload = _FROZEN_PAYLOADS.get(type_name)
+        if payload is None:
+            payload = _FROZEN_PAYLOADS[type_name] = _FrozenPayload({"$type": type_name})
+        return payload
+    return {"$type": type_name}
+
+
 # ============================================================================
 # EFFECTOR BUILDERS (86 confirmed — general + NPC + Gun + EnemyNPC + Vehicle + Destructible + TriggerZone + GLB animation)
 # Each returns the inner effector payload: {"$type": "...", ...params}
@@ -127,24 +183,24 @@ TRIGGER_TYPES = {
 
 # ── Visibility ──────────────────────────────────────────────────────────────
 
-def effector_show() -> Dict:
+def effector_show() -> Mapping:
     """Show a hidden item."""
-    return {"$type": "ShowObjectEvent"}
+    return _constant("ShowObjectEvent")
 
 
-def effector_hide() -> Dict:
+def effector_hide() -> Mapping:
     """Hide an item (invisible + no collider)."""
-    return {"$type": "HideObjectEvent"}
+    return _constant("HideObjectEvent")
 
 
-def effector_show_outline() -> Dict:
+def effector_show_outline() -> Mapping:
     """Show selection outline on the item."""
-    return {"$type": "ShowOutline"}
+    return _constant("ShowOutline")
 
 
-def effector_hide_outline() -> Dict:
+def effector_hide_outline() -> Mapping:
     """Remove selection outline from the item."""
-    return {"$type": "HideOutline"}
+    return _constant("HideOutline")
 
 
 def effector_duplicate(
@@ -216,9 +272,9 @@ def effector_move_to_spot(
     return result
 
 
-def effector_move_item_to_player() -> Dict:
+def effector_move_item_to_player() -> Mapping:
     """Teleport the item to the player's position."""
-    return {"$type": "MoveItemToPlayer"}
+    return _constant("MoveItemToPlayer")
 
 
 def effector_animation(
@@ -275,39 +331,47 @@ def effector_teleport(room_id: str, spawn_name: str = "", spawn_radius: float =
     return {"$type": "TeleportEvent", "id": room_id, "sn": spawn_name, "sr": spawn_radius}
 
 
+@functools.lru_cache(maxsize=256, typed=True)
+def _health_payload(op: Optional[int], amount: int) -> Dict:
+    """Cached ChangePlayerHealth template. Callers must copy before returning."""
+    if op is None:
+        return {"$type": "ChangePlayerHealth", "healthChange": amount}
+    return {"$type": "ChangePlayerHealth", "op": op, "healthChange": amount}
+
+
 def effector_heal(amount: int) -> Dict:
     """Heal the player by amount."""
-    return {"$type": "ChangePlayerHealth", "healthChange": amount}
+    return _health_payload(None, amount).copy()
 
 
 def effector_damage(amount: int) -> Dict:
     """Damage the player by amount."""
-    return {"$type": "ChangePlayerHealth", "op": 2, "healthChange": amount}
+    return _health_payload(2, amount).copy()
 
 
-def effector_damage_over_time() -> Dict:
+def effector_damage_over_time() -> Mapping:
     """Apply continuous damage while player is in contact."""
-    return {"$type": "DamageOverTime"}
+    return _constant("DamageOverTime")
 
 
-def effector_lock_movement() -> Dict:
+def effector_lock_movement() -> Mapping:
     """Freeze the player in place."""
-    return {"$type": "LockMovement"}
+    return _constant("LockMovement")
 
 
-def effector_unlock_movement() -> Dict:
+def effector_unlock_movement() -> Mapping:
     """Unfreeze the player."""
-    return {"$type": "UnlockMovement"}
+    return _constant("UnlockMovement")
 
 
-def effector_start_auto_run() -> Dict:
+def effector_start_auto_run() -> Mapping:
     """Force the player to auto-run forward."""
-    return {"$type": "StartAutoRun"}
+    return _constant("StartAutoRun")
 
 
-def effector_stop_auto_run() -> Dict:
+def effector_stop_auto_run() -> Mapping:
     """Stop forced auto-run."""
-    return {"$type": "StopAutoRun"}
+    return _constant("StopAutoRun")
 
 
 def effector_emote(animation_name: str) -> Dict:
@@ -322,29 +386,29 @@ def effector_emote(animation_name: str) -> Dict:
     return {"$type": "PlayerEmote", "animationName": animation_name}
 
 
-def effector_mute_player() -> Dict:
+def effector_mute_player() -> Mapping:
     """Mute the player's microphone."""
-    return {"$type": "MutePlayer"}
+    return _constant("MutePlayer")
 
 
-def effector_hide_all_players() -> Dict:
+def effector_hide_all_players() -> Mapping:
     """Hide all other players from this player's view."""
-    return {"$type": "HideAllPlayersEvent"}
+    return _constant("HideAllPlayersEvent")
 
 
-def effector_lock_avatar_change() -> Dict:
+def effector_lock_avatar_change() -> Mapping:
     """Prevent the player from changing their avatar."""
-    return {"$type": "LockAvatarChange"}
+    return _constant("LockAvatarChange")
 
 
-def effector_unlock_avatar_change() -> Dict:
+def effector_unlock_avatar_change() -> Mapping:
     """Allow the player to change their avatar again."""
-    return {"$type": "UnlockAvatarChange"}
+    return _constant("UnlockAvatarChange")
 
 
-def effector_display_avatar_screen() -> Dict:
+def effector_display_avatar_screen() -> Mapping:
     """Open the avatar selection screen."""
-    return {"$type": "DisplayAvatarScreen"}
+    return _constant("DisplayAvatarScreen")
 
 
 def effector_change_avatar(url: str, persistent: bool = True) -> Dict:
@@ -380,14 +444,14 @@ def effector_equip_wearable(item_id: str) -> Dict:
 
 # ── Camera ─────────────────────────────────────────────────────────────────
 
-def effector_lock_camera() -> Dict:
+def effector_lock_camera() -> Mapping:
     """Lock the camera in its current position/rotation."""
-    return {"$type": "LockCamera"}
+    return _constant("LockCamera")
 
 
-def effector_unlock_camera() -> Dict:
+def effector_unlock_camera() -> Mapping:
     """Unlock the camera to follow the player again."""
-    return {"$type": "UnlockCamera"}
+    return _constant("UnlockCamera")
 
 
 def effector_camera_zoom(zoom_amount: float, lock_zoom: bool = False) -> Dict:
@@ -401,9 +465,9 @@ def effector_camera_zoom(zoom_amount: float, lock_zoom: bool = False) -> Dict:
     return {"$type": "ChangeCameraZoom", "zoomAmount": zoom_amount, "lockZoom": lock_zoom}
 
 
-def effector_toggle_free_cam() -> Dict:
+def effector_toggle_free_cam() -> Mapping:
     """Toggle free camera mode (detach from player)."""
-    return {"$type": "ToggleFreeCam"}
+    return _constant("ToggleFreeCam")
 
 
 def effector_change_cam_state(cam_state: str, transition_speed: float = 1.0) -> Dict:
@@ -484,6 +548,12 @@ def effector_update_value(label: str = "", op: int = None, change: float = 1.0)
         op: Operation. OMIT op entirely (pass None) to SET the value. 1 = add, 2 = subtract, 3 = multiply, 4 = divide.
         change: Amount to set/change by.
     """
+    return _update_value_payload(label, op, change).copy()
+
+
+@functools.lru_cache(maxsize=256, typed=True)
+def _update_value_payload(label: str, op: Optional[int], change: float) -> Dict:
+    """Cached UpdateScoreEvent template. Callers must copy before returning."""
     e = {"$type": "UpdateScoreEvent", "scoreChange": change}
     if op is not None:
         e["op"] = op
@@ -553,7 +623,7 @@ def effector_run_triggers(
     for t in linked_tasks:
         entry = {
             "Trigger": {"Delay": t["delay"]} if t.get("delay") else {},
-            "Id": str(uuid.uuid4()),
+            "Id": generate_uuid(),
             "TargetState": t["target_state"],
             "Name": t["quest_name"],
             "TaskTriggerId": t["quest_id"]
@@ -566,9 +636,9 @@ def effector_run_triggers(
     return e
 
 
-def effector_reset_all_tasks() -> Dict:
+def effector_reset_all_tasks() -> Mapping:
     """Reset all quests in the room to their initial state."""
-    return {"$type": "ResetAllTasks"}
+    return _constant("ResetAllTasks")
 
 
 # ── Timers ─────────────────────────────────────────────────────────────────
@@ -708,9 +778,9 @@ def effector_change_bloom(intensity: float, clamp: float = 1.0, diffusion: float
     return {"$type": "ChangeBloom", "Intensity": intensity, "Clamp": clamp, "Diffusion": diffusion}
 
 
-def effector_change_time_of_day() -> Dict:
+def effector_change_time_of_day() -> Mapping:
     """Cycle the time of day (changes lighting/skybox)."""
-    return {"$type": "ChangeTimeOfDay"}
+    return _constant("ChangeTimeOfDay")
 
 
 def effector_rotate_skybox(rotation: float, duration: float = 1.0) -> Dict:
@@ -944,19 +1014,19 @@ def effector_npc_copy_player_path_stop(reset_position: bool = False) -> Dict:
     return result
 
 
-def effector_turn_to_player() -> Dict:
+def effector_turn_to_player() -> Mapping:
     """Make a GLBNPC turn to face the player who activated the effect. Attach to GLBNPC items."""
-    return {"$type": "TurnToPlayer"}
+    return _constant("TurnToPlayer")
 
 
-def effector_start_speaking() -> Dict:
+def effector_start_speaking() -> Mapping:
     """Start the GLBNPC's talking animation (visual only). Attach to GLBNPC items."""
-    return {"$type": "StartSpeaking"}
+    return _constant("StartSpeaking")
 
 
-def effector_stop_speaking() -> Dict:
+def effector_stop_speaking() -> Mapping:
     """Stop the GLBNPC's talking animation. Attach to GLBNPC items."""
-    return {"$type": "StopSpeaking"}
+    return _constant("StopSpeaking")
 
 
 # ── Token Swap ─────────────────────────────────────────────────────────────
@@ -972,13 +1042,18 @@ def effector_show_token_swap(swap_id: str, typ: int = 3) -> Dict:
     return {"$type": "DisplaySellSwap", "id": swap_id, "typ": typ}
 
 
-def effector_hide_token_swap() -> Dict:
+def effector_hide_token_swap() -> Mapping:
     """Hide the token swap UI."""
-    return {"$type": "HideSellSwap"}
+    return _constant("HideSellSwap")
 
 
 # ── Dialogue ───────────────────────────────────────────────────────────────
 
+def _mlh_id() -> str:
+    """Random quest-style ID: "mlh" + 12 lowercase base32hex chars."""
+    return "mlh" + base64.b32hexencode(os.urandom(8)).decode().lower()[:12]
+
+
 def effector_dialogue_display(
     character_name: str,
     dialogue_nodes: List[Dict],
@@ -1029,9 +1104,9 @@ def effector_dialogue_display(
             creator_uid="YOUR_FIREBASE_UID",
         )
     """
-    import json as _json
+    _dumps = json.dumps
 
-    story_id = str(uuid.uuid4())
+    story_id = generate_uuid()
 
     # Build task names for each node
     task_names = [f"-{i}_{node['question'][:30].replace(' ', ' ')}" for i, node in enumerate(dialogue_nodes)]
@@ -1043,7 +1118,7 @@ def effector_dialogue_display(
     tasks_sor_m = {}
     for i, node in enumerate(dialogue_nodes):
         name = task_names[i]
-        entry_id = str(uuid.uuid4())
+        entry_id = generate_uuid()
 
         # Build answer references
         answers = []
@@ -1055,12 +1130,12 @@ def effector_dialogue_display(
                 "Name": ans["text"]
             })
 
-        extra_text = _json.dumps({
+        extra_text = _dumps({
             "ExtraTaskDTODataDialog": {
                 "QT": node["question"],
                 "AT": answers
             }
-        })
+        }, separators=(',', ':'))
 
         base = {
             "Name": name,
@@ -1077,8 +1152,8 @@ def effector_dialogue_display(
         }
 
         # Generate unique IDs for inProgress and completed entries
-        id_progress = f"mlh{''.join(__import__('random').choices('abcdefghijklmnopqrstuvwxyz0123456789', k=12))}"
-        id_completed = f"mlh{''.join(__import__('random').choices('abcdefghijklmnopqrstuvwxyz0123456789', k=12))}"
+        id_progress = _mlh_id()
+        id_completed = _mlh_id()
 
         tasks_sor_m[name] = {
             "completed": {
@@ -1114,28 +1189,28 @@ def effector_dialogue_display(
 
 # ── Inventory ──────────────────────────────────────────────────────────────
 
-def effector_refresh_inventory() -> Dict:
+def effector_refresh_inventory() -> Mapping:
     """Refresh the player's inventory display."""
-    return {"$type": "RefreshUserInventory"}
+    return _constant("RefreshUserInventory")
 
 
 # ── Destructible ──────────────────────────────────────────────────────────
 
-def effector_respawn_destructible() -> Dict:
+def effector_respawn_destructible() -> Mapping:
     """Respawn a destroyed Destructible item. Attach to Destructible items."""
-    return {"$type": "RespawnDestructible"}
+    return _constant("RespawnDestructible")
 
 
 # ── Trigger Zone ──────────────────────────────────────────────────────────
 
-def effector_activate_trigger_zone() -> Dict:
+def effector_activate_trigger_zone() -> Mapping:
     """Re-enable a Trigger zone so it fires enter/exit events. Attach to Trigger items."""
-    return {"$type": "ActivateTriggerZoneEffect"}
+    return _constant("ActivateTriggerZoneEffect")
 
 
-def effector_deactivate_trigger_zone() -> Dict:
+def effector_deactivate_trigger_zone() -> Mapping:
     """Disable a Trigger zone so it stops firing enter/exit events. Attach to Trigger items."""
-    return {"$type": "DeactivateTriggerZoneEffect"}
+    return _constant("DeactivateTriggerZoneEffect")
 
 
 # ── GLB Animation ─────────────────────────────────────────────────────────
@@ -1165,19 +1240,19 @@ def effector_stop_animation(stop: float = 0.0) -> Dict:
 
 # ── EnemyNPC ──────────────────────────────────────────────────────────────
 
-def effector_revive_enemy() -> Dict:
+def effector_revive_enemy() -> Mapping:
     """Revive a dead EnemyNPC. Attach to EnemyNPC items."""
-    return {"$type": "ReviveEnemy"}
+    return _constant("ReviveEnemy")
 
 
-def effector_reset_enemy() -> Dict:
+def effector_reset_enemy() -> Mapping:
     """Reset an EnemyNPC to full health at its original position. Attach to EnemyNPC items."""
-    return {"$type": "ResetEnemy"}
+    return _constant("ResetEnemy")
 
 
-def effector_attack_player() -> Dict:
+def effector_attack_player() -> Mapping:
     """Force an EnemyNPC to immediately attack the nearest player. Attach to EnemyNPC items."""
-    return {"$type": "AttackPlayer"}
+    return _constant("AttackPlayer")
 
 
 def effector_change_enemy_health(op: int = 1, health_change: int = 1) -> Dict:
@@ -1213,121 +1288,121 @@ def effector_duplicate_enemy(spawn_name: str, count: int = 1, random_radius: flo
 
 # ── General Triggers (work on any item) ────────────────────────────────────
 
-def trigger_on_click() -> Dict:
+def trigger_on_click() -> Mapping:
     """Player clicks/taps the item."""
-    return {"$type": "OnClickEvent"}
+    return _constant("OnClickEvent")
 
 
-def trigger_on_collide() -> Dict:
+def trigger_on_collide() -> Mapping:
     """Player collides with the item (collision started)."""
-    return {"$type": "OnCollideEvent"}
+    return _constant("OnCollideEvent")
 
 
-def trigger_collision_stopped() -> Dict:
+def trigger_collision_stopped() -> Mapping:
     """Player stops colliding with the item."""
-    return {"$type": "OnCollisionStoppedEvent"}
+    return _constant("OnCollisionStoppedEvent")
 
 
-def trigger_hover_start() -> Dict:
+def trigger_hover_start() -> Mapping:
     """Player's cursor starts hovering over the item."""
-    return {"$type": "OnHoverStartEvent"}
+    return _constant("OnHoverStartEvent")
 
 
-def trigger_hover_end() -> Dict:
+def trigger_hover_end() -> Mapping:
     """Player's cursor stops hovering over the item."""
-    return {"$type": "OnHoverEndEvent"}
+    return _constant("OnHoverEndEvent")
 
 
-def trigger_player_logged_in() -> Dict:
+def trigger_player_logged_in() -> Mapping:
     """Player logs into the room (authenticated)."""
-    return {"$type": "OnPlayerLoggedIn"}
+    return _constant("OnPlayerLoggedIn")
 
 
-def trigger_player_died() -> Dict:
+def trigger_player_died() -> Mapping:
     """Player's health reaches zero."""
-    return {"$type": "OnPlayerDied"}
+    return _constant("OnPlayerDied")
 
 
-def trigger_player_move() -> Dict:
+def trigger_player_move() -> Mapping:
     """Player starts moving."""
-    return {"$type": "OnPlayerMove"}
+    return _constant("OnPlayerMove")
 
 
-def trigger_player_stopped_moving() -> Dict:
+def trigger_player_stopped_moving() -> Mapping:
     """Player stops moving."""
-    return {"$type": "OnPlayerStoppedMoving"}
+    return _constant("OnPlayerStoppedMoving")
 
 
-def trigger_key_pressed() -> Dict:
+def trigger_key_pressed() -> Mapping:
     """Player presses a key."""
-    return {"$type": "OnKeyPressedEvent"}
+    return _constant("OnKeyPressedEvent")
 
 
-def trigger_key_released() -> Dict:
+def trigger_key_released() -> Mapping:
     """Player releases a key."""
-    return {"$type": "OnKeyReleasedEvent"}
+    return _constant("OnKeyReleasedEvent")
 
 
-def trigger_mic_unmuted() -> Dict:
+def trigger_mic_unmuted() -> Mapping:
     """Player unmutes their microphone."""
-    return {"$type": "OnMicrophoneUnmuted"}
+    return _constant("OnMicrophoneUnmuted")
 
 
-def trigger_player_revived() -> Dict:
+def trigger_player_revived() -> Mapping:
     """Player is revived after dying."""
-    return {"$type": "OnPlayerRevived"}
+    return _constant("OnPlayerRevived")
 
 
-def trigger_timer_stopped() -> Dict:
+def trigger_timer_stopped() -> Mapping:
     """A timer is stopped (via StopTimerEffect)."""
-    return {"$type": "OnTimerStopped"}
+    return _constant("OnTimerStopped")
 
 
-def trigger_countdown_finished() -> Dict:
+def trigger_countdown_finished() -> Mapping:
     """A countdown timer reaches zero."""
-    return {"$type": "OnCountdownTimerFinished"}
+    return _constant("OnCountdownTimerFinished")
 
 
-def trigger_value_updated() -> Dict:
+def trigger_value_updated() -> Mapping:
     """A variable/score value is updated."""
-    return {"$type": "ScoreTrigger"}
+    return _constant("ScoreTrigger")
 
 
-def trigger_animation_stopped() -> Dict:
+def trigger_animation_stopped() -> Mapping:
     """A PortalsAnimation finishes playing."""
-    return {"$type": "OnAnimationStoppedEvent"}
+    return _constant("OnAnimationStoppedEvent")
 
 
-def trigger_item_collected() -> Dict:
+def trigger_item_collected() -> Mapping:
     """An item is collected by the player."""
-    return {"$type": "OnItemCollectedEvent"}
+    return _constant("OnItemCollectedEvent")
 
 
-def trigger_backpack_item_activated() -> Dict:
+def trigger_backpack_item_activated() -> Mapping:
     """A backpack/inventory item is clicked/activated."""
-    return {"$type": "OnItemClickEvent"}
+    return _constant("OnItemClickEvent")
 
 
-def trigger_player_leave() -> Dict:
+def trigger_player_leave() -> Mapping:
     """A player leaves the room."""
-    return {"$type": "PlayerLeave"}
+    return _constant("PlayerLeave")
 
 
-def trigger_swap_volume() -> Dict:
+def trigger_swap_volume() -> Mapping:
     """Swap volume trigger fires."""
-    return {"$type": "SwapVolume"}
+    return _constant("SwapVolume")
 
 
 # ── Trigger-Cube-Only Triggers (only work on prefabName: "Trigger") ──────
 
-def trigger_on_enter() -> Dict:
+def trigger_on_enter() -> Mapping:
     """Player enters the trigger zone. ONLY works on Trigger items."""
-    return {"$type": "OnEnterEvent"}
+    return _constant("OnEnterEvent")
 
 
-def trigger_on_exit() -> Dict:
+def trigger_on_exit() -> Mapping:
     """Player exits the trigger zone. ONLY works on Trigger items."""
-    return {"$type": "OnExitEvent"}
+    return _constant("OnExitEvent")
 
 
 # ── EnemyNPC-Only Triggers (only work on prefabName: "EnemyNPC") ──────────
@@ -1342,40 +1417,40 @@ def trigger_enemy_died(rtime: float = 0.0, delay: float = 0.0) -> Dict:
     return {"$type": "OnEnemyDied", "RTime": rtime, "Delay": delay}
 
 
-def trigger_take_damage() -> Dict:
+def trigger_take_damage() -> Mapping:
     """Enemy NPC took damage. ONLY works on EnemyNPC items."""
-    return {"$type": "OnTakeDamageTrigger"}
+    return _constant("OnTakeDamageTrigger")
 
 
 # ── Destructible-Only Triggers (only work on prefabName: "Destructible") ──
 
-def trigger_destroyed() -> Dict:
+def trigger_destroyed() -> Mapping:
     """Destructible item was destroyed. ONLY works on Destructible items."""
-    return {"$type": "OnDestroyedEvent"}
+    return _constant("OnDestroyedEvent")
 
 
 # ── Vehicle Triggers (prefabName: "Vehicle") ────────────────────────────────
 
-def trigger_vehicle_entered() -> Dict:
+def trigger_vehicle_entered() -> Mapping:
     """Player entered the vehicle. ONLY works on Vehicle items."""
-    return {"$type": "OnVehicleEntered"}
+    return _constant("OnVehicleEntered")
 
 
-def trigger_vehicle_exited() -> Dict:
+def trigger_vehicle_exited() -> Mapping:
     """Player exited the vehicle. ONLY works on Vehicle items."""
-    return {"$type": "OnVehicleExited"}
+    return _constant("OnVehicleExited")
 
 
 # ── Vehicle Effects (prefabName: "Vehicle") ──────────────────────────────────
 
-def effector_enter_vehicle() -> Dict:
+def effector_enter_vehicle() -> Mapping:
     """Force the player into the vehicle. Attach to Vehicle items."""
-    return {"$type": "EnterVehicle"}
+    return _constant("EnterVehicle")
 
 
-def effector_exit_vehicle() -> Dict:
+def effector_exit_vehicle() -> Mapping:
     """Force the player out of the vehicle. Attach to Vehicle items."""
-    return {"$type": "ExitVehicle"}
+    return _constant("ExitVehicle")
 
 
 def effector_vehicle_boost(
@@ -1416,46 +1491,46 @@ def trigger_gun_equipped(delay: float = 0.0) -> Dict:
     return t
 
 
-def trigger_shot_hit() -> Dict:
+def trigger_shot_hit() -> Mapping:
     """Bullet hit a target. ONLY works on Gun/Shotgun items."""
-    return {"$type": "ShotHitTrigger"}
+    return _constant("ShotHitTrigger")
 
 
-def trigger_got_kill() -> Dict:
+def trigger_got_kill() -> Mapping:
     """Player got a kill with this gun. ONLY works on Gun/Shotgun items."""
-    return {"$type": "GotKillTrigger"}
+    return _constant("GotKillTrigger")
 
 
-def trigger_started_aiming() -> Dict:
+def trigger_started_aiming() -> Mapping:
     """Player started aiming down sights. ONLY works on Gun/Shotgun items."""
-    return {"$type": "StartedAimingTrigger"}
+    return _constant("StartedAimingTrigger")
 
 
-def trigger_stopped_aiming() -> Dict:
+def trigger_stopped_aiming() -> Mapping:
     """Player stopped aiming down sights. ONLY works on Gun/Shotgun items."""
-    return {"$type": "StoppedAimingTrigger"}
+    return _constant("StoppedAimingTrigger")
 
 
-def trigger_gun_tossed() -> Dict:
+def trigger_gun_tossed() -> Mapping:
     """Player dropped/tossed the gun. ONLY works on Gun/Shotgun items."""
-    return {"$type": "OnGunTossedTrigger"}
+    return _constant("OnGunTossedTrigger")
 
 
 # ── Gun Effects (prefabName: "Gun" or "Shotgun") ─────────────────────────────
 
-def effector_equip_gun() -> Dict:
+def effector_equip_gun() -> Mapping:
     """Auto-equip the gun this effect is attached to. Attach to Gun/Shotgun items."""
-    return {"$type": "EquipGunEffect"}
+    return _constant("EquipGunEffect")
 
 
-def effector_toss_gun() -> Dict:
+def effector_toss_gun() -> Mapping:
     """Force the player to drop their equipped gun. Attach to Gun/Shotgun items."""
-    return {"$type": "TossGunEffect"}
+    return _constant("TossGunEffect")
 
 
-def effector_reset_gun() -> Dict:
+def effector_reset_gun() -> Mapping:
     """Reset gun state (ammo, reload). Attach to Gun/Shotgun items."""
-    return {"$type": "ResetGunEffect"}
+    return _constant("ResetGunEffect")
 
 
 # ============================================================================
@@ -1481,11 +1556,11 @@ def basic_interaction(trigger: Dict, effector: Dict) -> Dict:
         "Trigger": trigger,
         "DirectEffector": {
             "Effector": effector,
-            "Id": str(uuid.uuid4()),
+            "Id": generate_uuid(),
             "TargetState": 2,
             "Name": ""
         },
-        "Id": str(uuid.uuid4()),
+        "Id": generate_uuid(),
         "TargetState": 2,
         "Name": ""
     }
@@ -1513,7 +1588,7 @@ def quest_effector(
     task = {
         "$type": "TaskEffectorSubscription",
         "Effector": effector,
-        "Id": str(uuid.uuid4()),
+        "Id": generate_uuid(),
         "Name": quest_name,
         "TaskTriggerId": quest_id
     }
@@ -1548,7 +1623,7 @@ def quest_trigger(
     return {
         "$type": "TaskTriggerSubscription",
         "Trigger": trigger,
-        "Id": str(uuid.uuid4()),
+        "Id": generate_uuid(),
         "TargetState": target_state,
         "Name": quest_name,
         "TaskTriggerId": quest_id
@@ -1564,9 +1639,7 @@ def add_task_to_logic(logic: Dict, task: Dict) -> None:
     Add a task (trigger or effect subscription) to a logic entry's Tasks array.
     Modifies logic dict in-place.
     """
-    if "Tasks" not in logic:
-        logic["Tasks"] = []
-    logic["Tasks"].append(task)
+    logic.setdefault("Tasks", []).append(task)
 
 
 def add_tasks_to_logic(logic: Dict, tasks: List[Dict]) -> None:
@@ -1574,9 +1647,7 @@ def add_tasks_to_logic(logic: Dict, tasks: List[Dict]) -> None:
     Add multiple tasks to a logic entry's Tasks array.
     Modifies logic dict in-place.
     """
-    if "Tasks" not in logic:
-        logic["Tasks"] = []
-    logic["Tasks"].extend(tasks)
+    logic.setdefault("Tasks", []).extend(tasks)
 
 
 # ============================================================================
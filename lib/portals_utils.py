@@ -3,23 +3,40 @@ Portals MCP Utilities
 Provides helper functions for MCP operations, quest generation, and data validation.
 """
 
+import base64
+import functools
+import math
 import os
 import random
+import re
 import string
-import uuid
 import json
+from collections import Counter
+from collections.abc import Mapping
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # optional — falls back to the stdlib json module
+    orjson = None
 
 
 # ============================================================================
 # Environment & Configuration
 # ============================================================================
 
+_ACCESS_KEY_PREFIX = b"PORTALS_ACCESS_KEY="
+
+
+@functools.lru_cache(maxsize=1)
 def load_access_key() -> str:
     """
     Load PORTALS_ACCESS_KEY from .env file.
 
+    The result is cached after the first successful read; call
+    load_access_key.cache_clear() if .env changes mid-session.
+
     Returns:
         str: The access key
 
@@ -32,12 +49,22 @@ def load_access_key() -> str:
     if not env_path.exists():
         raise FileNotFoundError(f".env file not found at {env_path}")
 
-    with open(env_path) as f:
-        for line in f:
-            line = line.strip()
-            if line.startswith("PORTALS_ACCESS_KEY="):
-                key = line.split("=", 1)[1]
-                return key
+    # One read + bytes.find scans instead of splitting every line
+    data = env_path.read_bytes()
+    start = 0
+    while True:
+        i = data.find(_ACCESS_KEY_PREFIX, start)
+        if i < 0:
+            break
+        line_start = data.rfind(b"\n", 0, i) + 1
+        # Only a match at the start of a line (after optional indentation)
+        # counts — skips comments and keys like OTHER_PORTALS_ACCESS_KEY=
+        if not data[line_start:i].strip():
+            end = data.find(b"\n", i)
+            if end < 0:
+                end = len(data)
+            return data[i + len(_ACCESS_KEY_PREFIX):end].decode().rstrip()
+        start = i + 1
 
     raise ValueError("PORTALS_ACCESS_KEY not found in .env file")
 
@@ -58,6 +85,39 @@ def generate_quest_id() -> str:
     return f"mlh{chars}"
 
 
+# Private generator for generate_uuid, seeded from the OS so a
+# random.seed() elsewhere in the host process can't make IDs repeatable.
+# Reseeded in forked children so workers don't share one stream.
+_uuid_random = random.Random(os.urandom(32))
+_getrandbits = _uuid_random.getrandbits
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=lambda: _uuid_random.seed(os.urandom(32)))
+
+# UUID4 version nibble and RFC 4122 variant bits, same masks uuid.UUID applies
+_UUID4_CLEAR = ~((0xf000 << 64) | (0xc000 << 48))
+_UUID4_SET = (4 << 76) | (0x8000 << 48)
+
+
+def generate_uuid() -> str:
+    """
+    Generate a random UUID4-format string for task/entry IDs.
+
+    Same shape as str(uuid.uuid4()) but skips the UUID object construction,
+    which dominates bulk task building. Not cryptographically secure — these
+    IDs are opaque identifiers, not secrets.
+
+    Returns:
+        str: ID like "1b4e28ba-2fa1-41d2-883f-0016d3cca427"
+    """
+    return _format_uuid4(_getrandbits(128))
+
+
+def _format_uuid4(bits: int) -> str:
+    """Format 128 random bits as a dashed UUID4 string."""
+    h = "%032x" % ((bits & _UUID4_CLEAR) | _UUID4_SET)
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+
 def make_id_generator():
     """
     Returns a callable that generates sequential string IDs.
@@ -112,9 +172,14 @@ def create_quest_pair(
             - "quest_id": the inProgress quest ID (for use in triggers/effects)
             - "quest_name": the full quest name (for use in triggers/effects)
     """
-    entry_id = str(uuid.uuid4())
-    id_progress = generate_quest_id()
-    id_completed = generate_quest_id()
+    # One urandom call for all three IDs: 16 bytes for the EntryId UUID,
+    # 16 bytes base32hex-encoded into two 13-char quest ID suffixes.
+    # (base32hex rather than hex: an all-digit suffix fails validate_quest_id.)
+    raw = os.urandom(32)
+    entry_id = _format_uuid4(int.from_bytes(raw[:16], "big"))
+    suffixes = base64.b32hexencode(raw[16:]).decode().lower()
+    id_progress = "mlh" + suffixes[:13]
+    id_completed = "mlh" + suffixes[13:26]
     quest_name = f"{number}_{name_suffix}"
 
     if multiplayer:
@@ -124,7 +189,9 @@ def create_quest_pair(
     else:
         group = ""
 
-    base = {
+    # Build the inProgress entry directly and copy it for the completed entry,
+    # instead of building a separate base dict and copying it twice.
+    in_progress = {
         "EntryId": entry_id,
         "Name": quest_name,
         "Description": "created in unity",
@@ -141,13 +208,17 @@ def create_quest_pair(
         "Tracked": True,
         "Visible": visible,
         "ExtraText": "",
+        "Status": "inProgress",
+        "id": id_progress,
     }
 
-    entries = {
-        id_progress: {**base, "Status": "inProgress", "id": id_progress},
-        id_completed: {**base, "Status": "completed", "id": id_completed,
-                       "Rewards": [], "SuccessMsg": success_msg},
-    }
+    completed = dict(in_progress)
+    completed["Status"] = "completed"
+    completed["id"] = id_completed
+    completed["Rewards"] = []
+    completed["SuccessMsg"] = success_msg
+
+    entries = {id_progress: in_progress, id_completed: completed}
 
     return {
         "entries": entries,
@@ -160,6 +231,17 @@ def create_quest_pair(
 # Geometry & Transformations
 # ============================================================================
 
+_HALF_DEG_TO_RAD = math.pi / 360.0
+_HALF_PI = math.pi / 2
+
+# Module-level aliases: one global lookup instead of global + attribute
+_cos = math.cos
+_sin = math.sin
+_atan2 = math.atan2
+_asin = math.asin
+_copysign = math.copysign
+_degrees = math.degrees
+
 def quaternion_from_euler(yaw: float = 0.0, pitch: float = 0.0, roll: float = 0.0) -> Tuple[float, float, float, float]:
     """
     Convert Euler angles (degrees) to quaternion using Unity's ZXY rotation order.
@@ -172,18 +254,17 @@ def quaternion_from_euler(yaw: float = 0.0, pitch: float = 0.0, roll: float = 0.
     Returns:
         Tuple (qx, qy, qz, qw)
     """
-    import math
-
-    yaw_rad = math.radians(yaw)
-    pitch_rad = math.radians(pitch)
-    roll_rad = math.radians(roll)
-
-    cy = math.cos(yaw_rad * 0.5)
-    sy = math.sin(yaw_rad * 0.5)
-    cp = math.cos(pitch_rad * 0.5)
-    sp = math.sin(pitch_rad * 0.5)
-    cr = math.cos(roll_rad * 0.5)
-    sr = math.sin(roll_rad * 0.5)
+    # Half-angles in radians: one multiply instead of radians() then * 0.5
+    half_yaw = yaw * _HALF_DEG_TO_RAD
+    half_pitch = pitch * _HALF_DEG_TO_RAD
+    half_roll = roll * _HALF_DEG_TO_RAD
+
+    cy = _cos(half_yaw)
+    sy = _sin(half_yaw)
+    cp = _cos(half_pitch)
+    sp = _sin(half_pitch)
+    cr = _cos(half_roll)
+    sr = _sin(half_roll)
 
     # Unity ZXY extrinsic rotation order (= YXZ intrinsic)
     qw = cy * cp * cr + sy * sp * sr
@@ -194,6 +275,32 @@ def quaternion_from_euler(yaw: float = 0.0, pitch: float = 0.0, roll: float = 0.
     return (qx, qy, qz, qw)
 
 
+def quaternion_from_euler_batch(eulers):
+    """
+    Vectorized quaternion_from_euler for many rotations at once.
+
+    Args:
+        eulers: Array-like of shape (N, 3) with (yaw, pitch, roll) rows in degrees
+
+    Returns:
+        numpy.ndarray of shape (N, 4) with (qx, qy, qz, qw) rows
+    """
+    import numpy as np
+
+    half = np.asarray(eulers, dtype=np.float64).reshape(-1, 3) * _HALF_DEG_TO_RAD
+    c = np.cos(half)
+    s = np.sin(half)
+    cy, cp, cr = c[:, 0], c[:, 1], c[:, 2]
+    sy, sp, sr = s[:, 0], s[:, 1], s[:, 2]
+
+    out = np.empty((half.shape[0], 4))
+    out[:, 0] = cy * sp * cr + sy * cp * sr
+    out[:, 1] = sy * cp * cr - cy * sp * sr
+    out[:, 2] = cy * cp * sr - sy * sp * cr
+    out[:, 3] = cy * cp * cr + sy * sp * sr
+    return out
+
+
 def yrot(deg: float) -> Tuple[float, float, float, float]:
     """Shorthand for Y-axis rotation quaternion. Returns (qx, qy, qz, qw)."""
     return quaternion_from_euler(yaw=deg)
@@ -209,32 +316,37 @@ def euler_from_quaternion(qx: float, qy: float, qz: float, qw: float) -> Tuple[f
     Returns:
         Tuple (yaw, pitch, roll) in degrees
     """
-    import math
-
     # Roll (x-axis rotation)
     sinr_cosp = 2 * (qw * qx + qy * qz)
     cosr_cosp = 1 - 2 * (qx * qx + qy * qy)
-    roll = math.atan2(sinr_cosp, cosr_cosp)
+    roll = _atan2(sinr_cosp, cosr_cosp)
 
     # Pitch (y-axis rotation)
     sinp = 2 * (qw * qy - qz * qx)
     if abs(sinp) >= 1:
-        pitch = math.copysign(math.pi / 2, sinp)
+        pitch = _copysign(_HALF_PI, sinp)
     else:
-        pitch = math.asin(sinp)
+        pitch = _asin(sinp)
 
     # Yaw (z-axis rotation)
     siny_cosp = 2 * (qw * qz + qx * qy)
     cosy_cosp = 1 - 2 * (qy * qy + qz * qz)
-    yaw = math.atan2(siny_cosp, cosy_cosp)
+    yaw = _atan2(siny_cosp, cosy_cosp)
 
-    return (math.degrees(yaw), math.degrees(pitch), math.degrees(roll))
+    return (_degrees(yaw), _degrees(pitch), _degrees(roll))
 
 
 # ============================================================================
 # Data Validation
 # ============================================================================
 
+_HEX_DIGITS = frozenset(string.hexdigits)
+# Single anchored pattern: prefix, length and charset checked in one scan with
+# no slicing. (Splitting it into len/startswith guards plus a tail match only
+# speeds up rejects and is slower on valid IDs, the common case.)
+_QUEST_ID_MATCH = re.compile(r"mlh(?=[a-z0-9]*[a-z])[a-z0-9]{11,}\Z").match
+_QUEST_NAME_MATCH = re.compile(r"[0-9]+_.", re.S).match
+
 def validate_color(color: str) -> bool:
     """
     Check if color is valid 6-char hex (no # prefix).
@@ -245,7 +357,7 @@ def validate_color(color: str) -> bool:
     Returns:
         bool: True if valid
     """
-    return len(color) == 6 and all(c in string.hexdigits for c in color)
+    return len(color) == 6 and _HEX_DIGITS.issuperset(color)
 
 
 def validate_quest_id(quest_id: str) -> bool:
@@ -258,10 +370,7 @@ def validate_quest_id(quest_id: str) -> bool:
     Returns:
         bool: True if valid
     """
-    if not quest_id.startswith("mlh"):
-        return False
-    suffix = quest_id[3:]
-    return len(suffix) >= 11 and suffix.isalnum() and suffix.islower()
+    return _QUEST_ID_MATCH(quest_id) is not None
 
 
 def validate_quest_name(quest_name: str) -> bool:
@@ -272,12 +381,9 @@ def validate_quest_name(quest_name: str) -> bool:
         quest_name: Quest name to validate
 
     Returns:
-        bool: True if valid
+        bool: True if valid (False for non-strings such as None)
     """
-    if "_" not in quest_name:
-        return False
-    prefix, suffix = quest_name.split("_", 1)
-    return prefix.isdigit() and len(suffix) > 0
+    return isinstance(quest_name, str) and _QUEST_NAME_MATCH(quest_name) is not None
 
 
 # ============================================================================
@@ -294,7 +400,7 @@ def format_extra_data(data: Dict) -> str:
     Returns:
         str: JSON string with no whitespace
     """
-    return json.dumps(data, separators=(',', ':'))
+    return dumps_compact(data)
 
 
 def parse_extra_data(data_str: str) -> Dict:
@@ -307,116 +413,120 @@ def parse_extra_data(data_str: str) -> Dict:
     Returns:
         dict: Parsed data
     """
-    return json.loads(data_str)
+    return loads(data_str)
 
 
 # ============================================================================
 # Default Settings
 # ============================================================================
 
+_DEFAULT_SETTINGS_EXTRA_DATA = {
+    "welcomeEmbed": "",
+    "openWelcomeIframeInBackground": False,
+    "addWelcomeIframeToInfoButton": False,
+    "showWelcomeOnEntry": False,
+    "skyBoxDayTextureUrl": "",
+    "skyBoxNightTextureUrl": "",
+    "skyBoxDayRotation": 0,
+    "skyBoxNightRotation": 0,
+    "skyBoxDayExposure": 1.0,
+    "skyBoxNightExposure": 1.0,
+    "enableCustomAvatars": False,
+    "defaultToReadyPlayerMe": False,
+    "playerCollisions": True,
+    "preloadRoom": False,
+    "fastDownload": False,
+    "allowedUsers": 0,
+    "disableHToSpawn": False,
+    "playJoinSound": True,
+    "jumpSounds": False,
+    "showNameTags": True,
+    "showBackpack": True,
+    "showQuestLog": False,
+    "showPlayerCount": True,
+    "showMic": True,
+    "showMusic": True,
+    "showEmotes": True,
+    "showSpaceInfo": True,
+    "requestMicPopup": False,
+    "requireUsername": False,
+    "releasedRoom": "",
+    "uncompressedGLB": False,
+    "movementValues": {
+        "movementStateName": "",
+        "walkByDefault": False,
+        "walkSpeed": 2.0,
+        "runSpeed": 4.0,
+        "sprintSpeed": 6.8,
+        "strafing": False,
+        "jumpTimer": 0.3,
+        "jumpHeight": 4.0,
+        "airSpeed": 5.0,
+        "gravity": -10.0,
+        "rotationSpeed": 16.0,
+        "ledgeGrab": False,
+        "forceFirstPerson": False,
+        "stopVerticalInput": False,
+        "stopJumps": False,
+    },
+    "numericParameters": [],
+    "fog": {
+        "DayFogMax": 0.0,
+        "NightFogMax": 0.0,
+        "DayFogColor": "",
+        "NightFogColor": "",
+    },
+    "postprocess": {
+        "BloomDayIntensity": 0.0,
+        "BloomNightIntensity": 0.0,
+        "BloomDayClamp": 0.0,
+        "BloomNightClamp": 0.0,
+        "BloomDayDiffusion": 0.0,
+        "BloomNightDiffusion": 0.0,
+        "CameraMaxDistanceDay": 0.0,
+        "CameraMaxDistanceNight": 0.0,
+    },
+    "lightValues": {"NightShadows": 0},
+    "blockyAvatars": False,
+    "rpmAvatars": False,
+    "collectibleAvatars": False,
+    "customAvatars": False,
+    "roundyAvatars": False,
+    "guardianAvatars": True,
+    "psx": False,
+    "pixelation": 0.24,
+    "movementStates": [],
+    "customSpaceAvatars": [],
+    "customCameraStates": [],
+    "weaponDatas": [],
+    "defaultCameraState": -1,
+    "defaultWeapon": -1,
+    "defaultMovementState": -1,
+    "EventData": json.dumps({"itemNames": [], "itemEvents": []}, separators=(',', ':')),
+    "voiceChatRange": 14.0,
+    "globalChat": False,
+    "onboardingType": 1,
+    "RoomItemsData": [],
+    "carSettings": {
+        "acceleration": 0,
+        "drag": 0,
+        "maxSpeed": 0,
+        "steering": 0,
+        "mass": 0,
+        "gravity": 0,
+        "timeToMaxSteer": 0,
+    },
+    "showCombatUI": False,
+}
+
+# Serialized once at import; every default_settings() call shares the string.
+_DEFAULT_SETTINGS_EXTRA_DATA_JSON = json.dumps(_DEFAULT_SETTINGS_EXTRA_DATA, separators=(',', ':'))
+
+
 def default_settings() -> Dict:
     """Return a complete default settings dict matching the Portals schema.
     Includes roomBase, top-level fields, and a full roomSettingsExtraData JSON string.
     Use this as a starting point — override individual fields as needed."""
-    extra_data = {
-        "welcomeEmbed": "",
-        "openWelcomeIframeInBackground": False,
-        "addWelcomeIframeToInfoButton": False,
-        "showWelcomeOnEntry": False,
-        "skyBoxDayTextureUrl": "",
-        "skyBoxNightTextureUrl": "",
-        "skyBoxDayRotation": 0,
-        "skyBoxNightRotation": 0,
-        "skyBoxDayExposure": 1.0,
-        "skyBoxNightExposure": 1.0,
-        "enableCustomAvatars": False,
-        "defaultToReadyPlayerMe": False,
-        "playerCollisions": True,
-        "preloadRoom": False,
-        "fastDownload": False,
-        "allowedUsers": 0,
-        "disableHToSpawn": False,
-        "playJoinSound": True,
-        "jumpSounds": False,
-        "showNameTags": True,
-        "showBackpack": True,
-        "showQuestLog": False,
-        "showPlayerCount": True,
-        "showMic": True,
-        "showMusic": True,
-        "showEmotes": True,
-        "showSpaceInfo": True,
-        "requestMicPopup": False,
-        "requireUsername": False,
-        "releasedRoom": "",
-        "uncompressedGLB": False,
-        "movementValues": {
-            "movementStateName": "",
-            "walkByDefault": False,
-            "walkSpeed": 2.0,
-            "runSpeed": 4.0,
-            "sprintSpeed": 6.8,
-            "strafing": False,
-            "jumpTimer": 0.3,
-            "jumpHeight": 4.0,
-            "airSpeed": 5.0,
-            "gravity": -10.0,
-            "rotationSpeed": 16.0,
-            "ledgeGrab": False,
-            "forceFirstPerson": False,
-            "stopVerticalInput": False,
-            "stopJumps": False,
-        },
-        "numericParameters": [],
-        "fog": {
-            "DayFogMax": 0.0,
-            "NightFogMax": 0.0,
-            "DayFogColor": "",
-            "NightFogColor": "",
-        },
-        "postprocess": {
-            "BloomDayIntensity": 0.0,
-            "BloomNightIntensity": 0.0,
-            "BloomDayClamp": 0.0,
-            "BloomNightClamp": 0.0,
-            "BloomDayDiffusion": 0.0,
-            "BloomNightDiffusion": 0.0,
-            "CameraMaxDistanceDay": 0.0,
-            "CameraMaxDistanceNight": 0.0,
-        },
-        "lightValues": {"NightShadows": 0},
-        "blockyAvatars": False,
-        "rpmAvatars": False,
-        "collectibleAvatars": False,
-        "customAvatars": False,
-        "roundyAvatars": False,
-        "guardianAvatars": True,
-        "psx": False,
-        "pixelation": 0.24,
-        "movementStates": [],
-        "customSpaceAvatars": [],
-        "customCameraStates": [],
-        "weaponDatas": [],
-        "defaultCameraState": -1,
-        "defaultWeapon": -1,
-        "defaultMovementState": -1,
-        "EventData": json.dumps({"itemNames": [], "itemEvents": []}),
-        "voiceChatRange": 14.0,
-        "globalChat": False,
-        "onboardingType": 1,
-        "RoomItemsData": [],
-        "carSettings": {
-            "acceleration": 0,
-            "drag": 0,
-            "maxSpeed": 0,
-            "steering": 0,
-            "mass": 0,
-            "gravity": 0,
-            "timeToMaxSteer": 0,
-        },
-        "showCombatUI": False,
-    }
-
     return {
         "roomBase": "BlankScene",
         "onlyNftHolders": False,
@@ -428,7 +538,7 @@ def default_settings() -> Dict:
         "chatDisabled": False,
         "allCanBuild": False,
         "roomPrompt": "",
-        "roomSettingsExtraData": json.dumps(extra_data),
+        "roomSettingsExtraData": _DEFAULT_SETTINGS_EXTRA_DATA_JSON,
         "roomNodeExtraData": "",
         "bannedUsers": "",
         "shareLiveKitCrossInstances": False,
@@ -443,6 +553,41 @@ def default_settings() -> Dict:
 # Format Conversion
 # ============================================================================
 
+def json_default(obj: Any) -> Any:
+    """
+    Fallback encoder for values the JSON serializer can't handle natively.
+
+    Pass as ``default=`` to json.dumps (or orjson.dumps — same signature).
+    The serializer only calls it for unknown types, so plain dicts, lists
+    and scalars never go through it.
+
+    Handles read-only mappings (e.g. MappingProxyType payloads) and NumPy
+    arrays/scalars from geometry helpers.
+
+    Raises:
+        TypeError: If obj is not a supported type
+    """
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+if orjson is not None:
+    def dumps_compact(obj: Any) -> str:
+        """Serialize to a compact JSON string (no whitespace). Uses orjson."""
+        return orjson.dumps(obj, default=json_default, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    loads = orjson.loads
+else:
+    def dumps_compact(obj: Any) -> str:
+        """Serialize to a compact JSON string (no whitespace)."""
+        return json.dumps(obj, separators=(',', ':'), default=json_default)
+
+    loads = json.loads
+
+
 def serialize_logic(data: Dict) -> Dict:
     """Serialize logic dict values to JSON strings for MCP output.
     The platform expects logic values as JSON strings, not raw dicts.
@@ -451,7 +596,7 @@ def serialize_logic(data: Dict) -> Dict:
     logic = data.get("logic", {})
     for item_id, logic_entry in logic.items():
         if isinstance(logic_entry, dict):
-            logic[item_id] = json.dumps(logic_entry, separators=(',', ':'))
+            logic[item_id] = dumps_compact(logic_entry)
     # Ensure roomTasks always has the required "Tasks" key
     rt = data.get("roomTasks", {})
     if not isinstance(rt, dict):
@@ -465,17 +610,20 @@ def serialize_logic(data: Dict) -> Dict:
 def merge_logic_into_items(data: Dict) -> Dict:
     """Merge logic entries into items as extraData strings.
     Converts separated format to embedded format for tool consumption.
+    Logic values may be dicts or JSON strings — dicts are serialized in the
+    same pass, so there is no need to call serialize_logic() first.
     Mutates data in-place."""
     logic = data.pop("logic", {})
     items = data.get("roomItems", {})
     # Logic entries for non-existent items are silently dropped.
     # This is intentional — MCP data may contain orphaned logic entries.
     for item_id, logic_entry in logic.items():
-        if item_id in items:
+        item = items.get(item_id)
+        if item is not None:
             if isinstance(logic_entry, str):
-                items[item_id]["extraData"] = logic_entry
+                item["extraData"] = logic_entry
             else:
-                items[item_id]["extraData"] = json.dumps(logic_entry, separators=(',', ':'))
+                item["extraData"] = dumps_compact(logic_entry)
     return data
 
 
@@ -485,11 +633,13 @@ def split_logic_from_items(data: Dict) -> Dict:
     Mutates data in-place."""
     items = data.get("roomItems", {})
     logic = data.get("logic", {})
-    for item_id, item in list(items.items()):
+    # Only the item dicts are mutated, never the roomItems mapping itself,
+    # so iterating the live view is safe.
+    for item_id, item in items.items():
         if "extraData" in item:
             ed = item.pop("extraData")
             if isinstance(ed, str) and ed:
-                logic[item_id] = json.loads(ed)
+                logic[item_id] = loads(ed)
             elif isinstance(ed, dict):
                 logic[item_id] = ed
     data["logic"] = logic
@@ -628,8 +778,7 @@ def load_template(template_name: str) -> Dict:
     if not template_path.exists():
         raise FileNotFoundError(f"Template not found: {template_path}")
 
-    with open(template_path) as f:
-        return json.load(f)
+    return loads(template_path.read_bytes())
 
 
 def save_template(template_name: str, data: Dict) -> None:
@@ -646,8 +795,14 @@ def save_template(template_name: str, data: Dict) -> None:
     template_path = Path(__file__).parent.parent / "docs" / "patterns" / "templates" / template_name
     template_path.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(template_path, 'w') as f:
-        json.dump(data, f, indent=2)
+    # Templates stay indented for human review; orjson indents in C
+    if orjson is not None:
+        template_path.write_bytes(
+            orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        )
+    else:
+        with open(template_path, 'w') as f:
+            json.dump(data, f, indent=2)
 
 
 # ============================================================================
@@ -675,56 +830,74 @@ def save_template(template_name: str, data: Dict) -> None:
 # Validation Before Push
 # ============================================================================
 
-def validate_room_data(data: Dict) -> List[str]:
+def iter_room_data_errors(data: Dict) -> Iterator[str]:
     """
-    Validate room data before pushing to MCP.
+    Lazily yield validation errors for room data.
+
+    Error strings are only formatted when consumed, so a validity check can
+    stop at the first error: ``next(iter_room_data_errors(data), None) is None``.
 
     Args:
         data: Room data dict (may contain roomItems/items, logic, quests, settings)
 
-    Returns:
-        list: List of error messages (empty if valid)
+    Yields:
+        str: Error messages, in the same order as validate_room_data()
     """
-    errors = []
-
     # Accept both "items" and "roomItems" key names
     items_key = "roomItems" if "roomItems" in data else "items"
     items = data.get("roomItems", data.get("items", {}))
     if items and not isinstance(items, dict):
-        errors.append(f"{items_key} must be a dict")
+        yield f"{items_key} must be a dict"
     elif isinstance(items, dict):
         for item_id, item in items.items():
             if not isinstance(item_id, str):
-                errors.append(f"Item ID must be string, got {type(item_id)}")
+                yield f"Item ID must be string, got {type(item_id)}"
             if "prefabName" not in item:
-                errors.append(f"Item {item_id} missing prefabName")
+                yield f"Item {item_id} missing prefabName"
 
     # Validate logic if present
     logic = data.get("logic", {})
     if logic and not isinstance(logic, dict):
-        errors.append("logic must be a dict")
+        yield "logic must be a dict"
     elif isinstance(logic, dict):
         for item_id, entry in logic.items():
             if not isinstance(entry, dict):
-                errors.append(f"Logic entry {item_id} must be a dict, got {type(entry)}")
+                yield f"Logic entry {item_id} must be a dict, got {type(entry)}"
 
     # Validate quests if present (MCP flat-dict format: {quest_id: quest_entry, ...})
     if "quests" in data:
         quests = data["quests"]
         if not isinstance(quests, dict):
-            errors.append("quests must be a dict")
+            yield "quests must be a dict"
         else:
+            # Local bindings: this loop runs once per quest entry
+            valid_id = validate_quest_id
+            valid_name = validate_quest_name
             for quest_id, quest in quests.items():
-                if not validate_quest_id(quest_id):
-                    errors.append(f"Quest has invalid ID key: {quest_id}")
-                if quest.get("id") != quest_id:
-                    errors.append(f"Quest id field ({quest.get('id')}) doesn't match dict key ({quest_id})")
-                if "Name" in quest and not validate_quest_name(quest["Name"]):
-                    errors.append(f"Quest has invalid name format: {quest.get('Name')} (should be 0_name, 1_name, etc.)")
+                if not valid_id(quest_id):
+                    yield f"Quest has invalid ID key: {quest_id}"
+                field_id = quest.get("id")
+                if field_id != quest_id:
+                    yield f"Quest id field ({field_id}) doesn't match dict key ({quest_id})"
+                # Only a missing "Name" key skips the check; an explicit
+                # None is reported as an invalid name
+                if "Name" in quest and not valid_name(quest["Name"]):
+                    yield f"Quest has invalid name format: {quest['Name']} (should be 0_name, 1_name, etc.)"
                 if not quest.get("Creator"):
-                    errors.append(f"Quest {quest_id} missing Creator field (must be authenticated user's UID)")
+                    yield f"Quest {quest_id} missing Creator field (must be authenticated user's UID)"
 
-    return errors
+
+def validate_room_data(data: Dict) -> List[str]:
+    """
+    Validate room data before pushing to MCP.
+
+    Args:
+        data: Room data dict (may contain roomItems/items, logic, quests, settings)
+
+    Returns:
+        list: List of error messages (empty if valid)
+    """
+    return list(iter_room_data_errors(data))
 
 
 # ============================================================================
@@ -782,80 +955,209 @@ _PREFAB_CATEGORIES = {
     "Leaderboard": "leaderboard",
 }
 
+
+# Known categories plus the lowercased fallback for each unknown prefab seen
+_CATEGORY_CACHE: Dict[str, str] = dict(_PREFAB_CATEGORIES)
+
+
+def _prefab_category(prefab: str) -> str:
+    """Summary category for a prefab name; unknown prefabs fall back to lowercase."""
+    category = _CATEGORY_CACHE.get(prefab)
+    if category is None:
+        category = _CATEGORY_CACHE[prefab] = prefab.lower()
+    return category
+
+
+# Prefab categories that make up each Detail Layers column (disjoint)
+_STRUCTURAL_CATEGORIES = frozenset({"cube", "glb"})
+_FUNCTIONAL_CATEGORIES = frozenset({
+    "trigger", "collectible", "jumppad", "gun", "destructible", "portal",
+})
+_ATMOSPHERIC_CATEGORIES = frozenset({"light", "effect"})
+_DECORATIVE_CATEGORIES = frozenset({"npc", "image", "text", "video", "leaderboard"})
+
 # Trigger type names that indicate player interactions
-_TRIGGER_TYPES = {
+_TRIGGER_TYPES = frozenset({
     "OnClickEvent", "OnCollideEvent", "OnCollisionStoppedEvent",
     "OnEnterEvent", "OnExitEvent",
     "OnHoverStartEvent", "OnHoverEndEvent",
     "OnKeyPressedEvent", "OnKeyReleasedEvent",
     "OnItemCollectedEvent", "OnItemClickEvent",
     "OnGunEquippedTrigger", "ShotHitTrigger", "GotKillTrigger",
-}
+})
 
 # Effect type names for audio
-_AUDIO_EFFECTS = {"PlaySoundOnce", "PlaySoundInALoop", "StopSound"}
+_AUDIO_EFFECTS = frozenset({"PlaySoundOnce", "PlaySoundInALoop", "StopSound"})
 
 # Effect type names for visual feedback
-_VISUAL_EFFECTS = {
+_VISUAL_EFFECTS = frozenset({
     "ShowObjectEvent", "HideObjectEvent", "ShowOutline", "HideOutline",
     "MoveToSpot", "DuplicateItem", "PlayAnimationOnce",
     "PlayerEmote", "NotificationPillEvent", "NPCMessageEvent",
-}
+})
 
 # Effect type names for camera
-_CAMERA_EFFECTS = {
+_CAMERA_EFFECTS = frozenset({
     "SetCameraFilter", "ChangeCameraZoom", "ChangeBloom",
     "ChangeFog", "RotateSkybox", "LockCamera", "UnlockCamera",
+})
+
+
+# $type → summary bucket, so classifying a type is one dict lookup.
+# The four category sets above are disjoint.
+_TYPE_TO_BUCKET = {
+    **{t: "triggers" for t in _TRIGGER_TYPES},
+    **{t: "audio" for t in _AUDIO_EFFECTS},
+    **{t: "visual" for t in _VISUAL_EFFECTS},
+    **{t: "camera" for t in _CAMERA_EFFECTS},
 }
 
 
-def _count_types_in_logic(logic_entry: Dict) -> Dict[str, int]:
-    """Count $type occurrences by category in a logic dict."""
-    counts = {"triggers": 0, "audio": 0, "visual": 0, "camera": 0}
+# "$type": "Name" pairs in raw logic JSON. Escaped pairs inside nested
+# JSON strings (\"$type\") don't match, just as the dict walk skips them.
+_TYPE_FINDALL = re.compile(r'"\$type"\s*:\s*"([^"\\]*)"').findall
+
+
+def _collect_type_counter(logic_entry) -> Counter:
+    """Count every $type value in a logic entry with a single traversal.
+
+    Accepts the parsed dict or its serialized JSON string; strings are
+    scanned with a regex instead of being parsed into a throwaway tree.
+    """
     if not logic_entry:
-        return counts
-    type_values = []
-    _collect_types(logic_entry, type_values)
-    for t in type_values:
-        if t in _TRIGGER_TYPES:
-            counts["triggers"] += 1
-        if t in _AUDIO_EFFECTS:
-            counts["audio"] += 1
-        if t in _VISUAL_EFFECTS:
-            counts["visual"] += 1
-        if t in _CAMERA_EFFECTS:
-            counts["camera"] += 1
+        return Counter()
+    if isinstance(logic_entry, str):
+        return Counter(_TYPE_FINDALL(logic_entry))
+    return Counter(_iter_types(logic_entry))
+
+
+def _bucket_counts(type_counter: Counter) -> Dict[str, int]:
+    """Count $type occurrences by category from a _collect_type_counter() result."""
+    counts = {"triggers": 0, "audio": 0, "visual": 0, "camera": 0}
+    for t, n in type_counter.items():
+        bucket = _TYPE_TO_BUCKET.get(t)
+        if bucket is not None:
+            counts[bucket] += n
     return counts
 
 
-def _collect_types(obj, result: list):
-    """Recursively collect all $type values from a nested structure."""
-    if isinstance(obj, dict):
-        if "$type" in obj:
-            result.append(obj["$type"])
-        for v in obj.values():
-            _collect_types(v, result)
-    elif isinstance(obj, list):
-        for item in obj:
-            _collect_types(item, result)
+# JSON leaf types, ruled out before the (slow, ABC-based) Mapping check
+_JSON_SCALARS = frozenset({str, int, float, bool, type(None)})
 
 
-def _logic_has_type(logic_entry: Dict, type_name: str) -> bool:
-    """Check if a logic entry contains a specific $type value."""
-    if not logic_entry:
-        return False
-    type_vals = []
-    _collect_types(logic_entry, type_vals)
-    return type_name in type_vals
+def _iter_types(obj) -> Iterator[str]:
+    """Yield every $type value in a nested structure (order not preserved).
 
+    Iterative with an explicit stack, so deeply nested Tasks trees cost no
+    Python frames and can't hit the recursion limit. Plain dicts and lists
+    are dispatched by exact type; other Mappings (e.g. the read-only
+    payloads from portals_effects) and list subclasses still go through
+    isinstance.
+    """
+    stack = [obj]
+    pop = stack.pop
+    extend = stack.extend
+    while stack:
+        cur = pop()
+        cls = type(cur)
+        if cls is dict or (
+            cls not in _JSON_SCALARS and cls is not list and isinstance(cur, Mapping)
+        ):
+            t = cur.get("$type")
+            if t is not None:
+                yield t
+            extend(cur.values())
+        elif cls is list or (cls not in _JSON_SCALARS and isinstance(cur, list)):
+            extend(cur)
+
+
+# Shared read-only default for items without a position (never mutated)
+_EMPTY: Dict = {}
+
+
+# Above this many items, zone assignment switches to NumPy broadcasting
+_VECTORIZE_ZONES_MIN_ITEMS = 64
+
+
+def _assign_zones(
+    items: Dict, zones: Dict[str, Tuple[float, float, float, float]]
+) -> Tuple[Dict[str, List[str]], Dict[str, int], int]:
+    """
+    Assign items to zones.
 
-def _item_in_zone(item: Dict, bounds: Tuple[float, float, float, float]) -> bool:
-    """Check if item position falls within zone bounds (x_min, x_max, z_min, z_max)."""
-    pos = item.get("position", {})
-    x = pos.get("x", 0)
-    z = pos.get("z", 0)
-    x_min, x_max, z_min, z_max = bounds
-    return x_min <= x <= x_max and z_min <= z <= z_max
+    Zones may overlap: counts use the first matching zone (in zones order),
+    but the member lists record every zone that contains the item.
+
+    Returns:
+        (zone_item_ids, zone_counts, unzoned) — member ids per zone, item
+        counts per zone in first-seen order, and the number of unzoned items
+    """
+    if len(items) > _VECTORIZE_ZONES_MIN_ITEMS:
+        try:
+            import numpy as np
+        except ImportError:
+            pass
+        else:
+            return _assign_zones_numpy(np, items, zones)
+
+    # Read each position once, then test zone-major so the bounds are
+    # unpacked once per zone rather than once per (item, zone) pair
+    coords = []
+    for item_id, item in items.items():
+        pos = item.get("position") or _EMPTY
+        coords.append((item_id, pos.get("x", 0), pos.get("z", 0)))
+
+    zone_item_ids = {}
+    first_zone: Dict[str, str] = {}
+    for zone_name, (x_min, x_max, z_min, z_max) in zones.items():
+        members = zone_item_ids[zone_name] = []
+        for item_id, x, z in coords:
+            if x_min <= x <= x_max and z_min <= z <= z_max:
+                members.append(item_id)
+                if item_id not in first_zone:
+                    first_zone[item_id] = zone_name
+
+    # Count in item order so zones appear in first-seen order
+    zone_counts: Dict[str, int] = {}
+    unzoned = 0
+    for item_id, _, _ in coords:
+        zone_name = first_zone.get(item_id)
+        if zone_name is None:
+            unzoned += 1
+        else:
+            zone_counts[zone_name] = zone_counts.get(zone_name, 0) + 1
+    return zone_item_ids, zone_counts, unzoned
+
+
+def _assign_zones_numpy(np, items: Dict, zones: Dict) -> Tuple[Dict[str, List[str]], Dict[str, int], int]:
+    """_assign_zones() as one (items x zones) boolean mask; same results."""
+    ids = list(items)
+    n = len(ids)
+    positions = [item.get("position") or _EMPTY for item in items.values()]
+    xs = np.fromiter((pos.get("x", 0) for pos in positions), dtype=np.float64, count=n)
+    zs = np.fromiter((pos.get("z", 0) for pos in positions), dtype=np.float64, count=n)
+    zone_names = list(zones)
+    bounds = np.array([zones[name] for name in zone_names], dtype=np.float64)
+
+    x = xs[:, None]
+    z = zs[:, None]
+    mask = (x >= bounds[:, 0]) & (x <= bounds[:, 1]) & (z >= bounds[:, 2]) & (z <= bounds[:, 3])
+
+    zone_item_ids = {
+        name: [ids[i] for i in np.flatnonzero(mask[:, k])]
+        for k, name in enumerate(zone_names)
+    }
+
+    # First matching zone per item, matching the loop's break-on-first-match
+    placed = mask.any(axis=1)
+    first_zone = mask.argmax(axis=1)[placed]
+    counts = np.bincount(first_zone, minlength=len(zone_names))
+    # Keep zones in the order their first item appears, like the dict loop
+    seen_zones, first_index = np.unique(first_zone, return_index=True)
+    order = seen_zones[np.argsort(first_index)]
+    zone_counts = {zone_names[k]: int(counts[k]) for k in order}
+
+    return zone_item_ids, zone_counts, int(n - placed.sum())
 
 
 def generate_build_summary(
@@ -876,7 +1178,8 @@ def generate_build_summary(
     Args:
         game_name: Name of the game
         items: dict of room items (keyed by string IDs)
-        logic: dict of logic entries (keyed by item ID, values are dicts)
+        logic: dict of logic entries (keyed by item ID, values are dicts or
+               their serialized JSON strings)
         quests: dict of quest entries (keyed by quest IDs)
         zones: optional dict mapping zone names to (x_min, x_max, z_min, z_max) bounds.
                If not provided, zone breakdown is omitted.
@@ -886,26 +1189,17 @@ def generate_build_summary(
     Returns:
         str: formatted build summary
     """
-    lines = []
-    lines.append(f"BUILD SUMMARY — {game_name}")
-    lines.append("=" * 50)
-
-    total_items = len(items)
-    lines.append(f"Total Items: {total_items}")
+    lines = [
+        f"BUILD SUMMARY — {game_name}",
+        "=" * 50,
+        f"Total Items: {len(items)}",
+    ]
 
     # --- Items by zone ---
+    # Zone membership is computed once here and reused by Detail Layers
+    zone_item_ids: Dict[str, List[str]] = {}
     if zones:
-        zone_counts = {}
-        unzoned = 0
-        for item in items.values():
-            placed = False
-            for zone_name, bounds in zones.items():
-                if _item_in_zone(item, bounds):
-                    zone_counts[zone_name] = zone_counts.get(zone_name, 0) + 1
-                    placed = True
-                    break
-            if not placed:
-                unzoned += 1
+        zone_item_ids, zone_counts, unzoned = _assign_zones(items, zones)
         zone_parts = [f"{name}({count})" for name, count in zone_counts.items()]
         if unzoned:
             zone_parts.append(f"unzoned({unzoned})")
@@ -913,29 +1207,47 @@ def generate_build_summary(
     lines.append("")
 
     # --- Items by type ---
-    type_counts: Dict[str, int] = {}
-    for item in items.values():
-        prefab = item.get("prefabName", "unknown")
-        category = _PREFAB_CATEGORIES.get(prefab, prefab.lower())
-        type_counts[category] = type_counts.get(category, 0) + 1
+    type_counts = Counter(
+        _prefab_category(item.get("prefabName", "unknown")) for item in items.values()
+    )
 
     lines.append("By Type:")
     type_line_parts = [f"  {cat}: {count}" for cat, count in sorted(type_counts.items())]
     # Group into rows of 4 for readability
-    for i in range(0, len(type_line_parts), 4):
-        lines.append("  " + "  |".join(type_line_parts[i:i+4]))
+    lines.extend(
+        "  " + "  |".join(type_line_parts[i:i+4])
+        for i in range(0, len(type_line_parts), 4)
+    )
     lines.append("")
 
     # --- Interaction analysis ---
-    trigger_counts: Dict[str, int] = {}
+    trigger_counts: Counter = Counter()
     items_with_audio = 0
     items_with_visual = 0
     items_with_camera = 0
     items_with_interactions = 0
+    ambient_loops = 0
+    oneshot_sounds = 0
+    music_changes = 0
 
-    for item_id, item in items.items():
-        logic_entry = logic.get(item_id, {})
-        counts = _count_types_in_logic(logic_entry)
+    # Walk each logic entry once; this loop and Detail Layers read the counters
+    # Only items that actually carry logic get an entry, so a room with
+    # little or no logic skips the per-item walk instead of counting nothing.
+    # Entries shared between items (same object) are walked once; keying by
+    # id() is safe because logic keeps every entry alive for this call.
+    per_item_types: Dict[str, Counter] = {}
+    counter_by_entry: Dict[int, Counter] = {}
+    for item_id, logic_entry in logic.items():
+        if item_id not in items:
+            continue
+        types = counter_by_entry.get(id(logic_entry))
+        if types is None:
+            types = counter_by_entry[id(logic_entry)] = _collect_type_counter(logic_entry)
+        if types:
+            per_item_types[item_id] = types
+
+    for types in per_item_types.values():
+        counts = _bucket_counts(types)
         if counts["triggers"] > 0:
             items_with_interactions += 1
         if counts["audio"] > 0:
@@ -946,60 +1258,44 @@ def generate_build_summary(
             items_with_camera += 1
 
         # Count individual trigger types
-        if logic_entry:
-            type_vals = []
-            _collect_types(logic_entry, type_vals)
-            for t in type_vals:
-                if t in _TRIGGER_TYPES:
-                    trigger_counts[t] = trigger_counts.get(t, 0) + 1
+        for t, n in types.items():
+            if t in _TRIGGER_TYPES:
+                trigger_counts[t] += n
+
+        # Audio: O(1) membership probes on the same counter
+        if "PlaySoundInALoop" in types:
+            ambient_loops += 1
+        if "PlaySoundOnce" in types:
+            oneshot_sounds += 1
+        if "ChangeAudiusEffect" in types:
+            music_changes += 1
 
     lines.append("Interactions:")
     if trigger_counts:
-        for trig, count in sorted(trigger_counts.items()):
-            short = trig.replace("Event", "").replace("Trigger", "")
-            lines.append(f"  {short}: {count}")
+        lines.extend(
+            f"  {trig.replace('Event', '').replace('Trigger', '')}: {count}"
+            for trig, count in sorted(trigger_counts.items())
+        )
     else:
         lines.append("  (no item-level triggers found — check quest linkedTasks)")
     lines.append("")
 
     # --- Audio ---
-    ambient_loops = 0
-    oneshot_sounds = 0
-    music_changes = 0
-    for item_id in items:
-        logic_entry = logic.get(item_id, {})
-        if not logic_entry:
-            continue
-        type_vals = []
-        _collect_types(logic_entry, type_vals)
-        type_set = set(type_vals)
-        if "PlaySoundInALoop" in type_set:
-            ambient_loops += 1
-        if "PlaySoundOnce" in type_set:
-            oneshot_sounds += 1
-        if "ChangeAudiusEffect" in type_set:
-            music_changes += 1
-
     lines.append("Audio:")
     lines.append(f"  Ambient loops: {ambient_loops}  |  One-shot sounds: {oneshot_sounds}  |  Music changes: {music_changes}")
     lines.append("")
 
     # --- Quests ---
-    total_quests = 0
-    visible_quests = 0
-    hidden_quests = 0
-    # Count unique quests by EntryId (each quest has inProgress + completed entries)
-    seen_entries = set()
-    for quest in quests.values():
-        entry_id = quest.get("EntryId", quest.get("id", ""))
-        if entry_id in seen_entries:
-            continue
-        seen_entries.add(entry_id)
-        total_quests += 1
-        if quest.get("Visible", False):
-            visible_quests += 1
-        else:
-            hidden_quests += 1
+    # Count unique quests by EntryId (each quest has inProgress + completed entries);
+    # the first entry seen for an EntryId decides its visibility
+    total_quests = visible_quests = hidden_quests = 0
+    if quests:
+        unique_quests: Dict[str, Dict] = {}
+        for quest in quests.values():
+            unique_quests.setdefault(quest.get("EntryId", quest.get("id", "")), quest)
+        total_quests = len(unique_quests)
+        visible_quests = sum(1 for quest in unique_quests.values() if quest.get("Visible", False))
+        hidden_quests = total_quests - visible_quests
 
     lines.append("Quests:")
     lines.append(f"  Total: {total_quests}  |  Visible: {visible_quests}  |  Hidden: {hidden_quests}")
@@ -1016,41 +1312,41 @@ def generate_build_summary(
     # --- Detail layers per zone ---
     if zones:
         lines.append("Detail Layers:")
-        for zone_name, bounds in zones.items():
-            zone_item_ids = [iid for iid, item in items.items() if _item_in_zone(item, bounds)]
-            zone_items = [items[iid] for iid in zone_item_ids]
-            has_structural = any(
-                _PREFAB_CATEGORIES.get(i.get("prefabName", ""), "") in ("cube", "glb")
-                for i in zone_items
-            )
-            has_functional = any(
-                _PREFAB_CATEGORIES.get(i.get("prefabName", ""), "") in
-                ("trigger", "collectible", "jumppad", "gun", "destructible", "portal")
-                for i in zone_items
-            )
-            # Check for atmospheric: lights/effects or ambient sound loops in logic
-            has_atmospheric = any(
-                _PREFAB_CATEGORIES.get(items[iid].get("prefabName", ""), "") in ("light", "effect")
-                or _logic_has_type(logic.get(iid, {}), "PlaySoundInALoop")
-                for iid in zone_item_ids
-            )
-            has_decorative = any(
-                _PREFAB_CATEGORIES.get(i.get("prefabName", ""), "") in
-                ("npc", "image", "text", "video", "leaderboard")
-                for i in zone_items
-            )
-            s = "Y" if has_structural else "N"
-            f = "Y" if has_functional else "N"
-            a = "Y" if has_atmospheric else "N"
-            d = "Y" if has_decorative else "N"
-            lines.append(f"  {zone_name}: structural={s} | functional={f} | atmospheric={a} | decorative={d}")
+        # Partition item ids by detail layer once (unknown prefab = no layer);
+        # each zone then needs only an isdisjoint() probe per layer
+        structural_ids = set()
+        functional_ids = set()
+        atmospheric_ids = set()
+        decorative_ids = set()
+        for iid, item in items.items():
+            category = _PREFAB_CATEGORIES.get(item.get("prefabName", ""), "")
+            if category in _STRUCTURAL_CATEGORIES:
+                structural_ids.add(iid)
+            elif category in _FUNCTIONAL_CATEGORIES:
+                functional_ids.add(iid)
+            elif category in _ATMOSPHERIC_CATEGORIES:
+                atmospheric_ids.add(iid)
+            elif category in _DECORATIVE_CATEGORIES:
+                decorative_ids.add(iid)
+        # Ambient sound loops in logic also count as atmospheric; only items
+        # with logic can have one, so walk those rather than every item
+        atmospheric_ids.update(
+            iid for iid, types in per_item_types.items() if "PlaySoundInALoop" in types
+        )
+
+        lines.extend(
+            f"  {zone_name}: structural={'N' if structural_ids.isdisjoint(ids) else 'Y'}"
+            f" | functional={'N' if functional_ids.isdisjoint(ids) else 'Y'}"
+            f" | atmospheric={'N' if atmospheric_ids.isdisjoint(ids) else 'Y'}"
+            f" | decorative={'N' if decorative_ids.isdisjoint(ids) else 'Y'}"
+            for zone_name, ids in zone_item_ids.items()
+        )
         lines.append("")
 
     # --- Spectacle moments ---
     if spectacle_moments:
         lines.append(f"Spectacle Moments: {len(spectacle_moments)} identified")
-        for moment in spectacle_moments:
-            lines.append(f"  - {moment}")
+        lines.extend(f"  - {moment}" for moment in spectacle_moments)
     else:
         lines.append("Spectacle Moments: 0 identified")
     lines.append("")
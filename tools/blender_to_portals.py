@@ -7,23 +7,46 @@ Portals-coordinate transform.
 
 Mesh instancing: objects that share the same Blender mesh datablock are
 exported only once. All instances reference the same GLB file in the manifest,
-each with their own world-space transform.
+each with their own world-space transform. Separate datablocks with identical
+content (typical after importing the same asset more than once) are detected
+by fingerprint and share a GLB as well.
 
 Usage:
     blender --background scene.blend --python tools/blender_to_portals.py -- /output/dir
 
 Everything after the "--" separator in sys.argv belongs to this script.
 The first (and only required) argument is the output directory.
+
+Options (after the output directory):
+    --workers N   Export GLBs in N background Blender processes (default 1).
+                  Needs the scene saved to a .blend file; otherwise exports
+                  run in this process.
+    --gltf NAME=VALUE
+                  Override a glTF exporter setting (repeatable), e.g.
+                  --gltf export_animations=true.  VALUE is parsed as JSON,
+                  falling back to a plain string.  On exporters that have it,
+                  --gltf export_shared_accessors=true lets multi-material
+                  meshes share one vertex buffer across their primitives.
 """
 
 import sys
 import os
+import hashlib
 import json
+import subprocess
+import tempfile
+from typing import Optional
 import re
 import math
+import string
 
 import bpy  # available inside Blender's Python environment
 
+try:
+    import orjson  # optional: faster manifest encoding if installed into Blender's Python
+except ImportError:
+    orjson = None
+
 
 # ---------------------------------------------------------------------------
 # Argument parsing
@@ -38,15 +61,49 @@ def parse_args():
         return []
 
 
+def parse_options(args: list[str]) -> dict:
+    """
+    Split the script arguments into the output directory and options.
+
+    Returns {"output_dir": str, "workers": int, "gltf": dict,
+    "export_worker": str | None}.  --export-worker is internal: it makes this
+    process a worker that exports the jobs listed in the given JSON file,
+    then exits.
+    """
+    options = {"output_dir": args[0], "workers": 1, "gltf": {}, "export_worker": None}
+    rest = iter(args[1:])
+    for arg in rest:
+        if arg == "--workers":
+            options["workers"] = max(1, int(next(rest, "1")))
+        elif arg == "--gltf":
+            name, _, value = next(rest, "").partition("=")
+            try:
+                options["gltf"][name] = json.loads(value)
+            except ValueError:
+                options["gltf"][name] = value
+        elif arg == "--export-worker":
+            options["export_worker"] = next(rest, None)
+        else:
+            print(f"WARNING: Ignoring unknown argument '{arg}'")
+    return options
+
+
 # ---------------------------------------------------------------------------
 # Name sanitisation & deduplication
 # ---------------------------------------------------------------------------
 
 _UNSAFE_CHARS = re.compile(r"[^A-Za-z0-9_\-]")
 
+# Byte table for the common all-ASCII case: safe bytes map to themselves,
+# everything else to "_" (same character class as _UNSAFE_CHARS)
+_SAFE_BYTES = frozenset((string.ascii_letters + string.digits + "_-").encode())
+_SANITIZE_TABLE = bytes(b if b in _SAFE_BYTES else ord("_") for b in range(256))
+
 
 def sanitize_name(name: str) -> str:
     """Replace dots, spaces, and other non-filesystem-safe chars with underscores."""
+    if name.isascii():
+        return name.encode("ascii").translate(_SANITIZE_TABLE).decode("ascii")
     return _UNSAFE_CHARS.sub("_", name)
 
 
@@ -54,21 +111,24 @@ def deduplicate_names(names: list[str]) -> list[str]:
     """
     Given a list of sanitised names, append _2, _3 ... for any duplicates so
     every entry is unique.  Preserves order.
+
+    Each base name remembers the next suffix to try, so repeated collisions
+    resume where the last one stopped instead of rescanning from _2.
     """
-    seen: dict[str, int] = {}
+    claimed: set[str] = set()
+    next_suffix: dict[str, int] = {}
     result: list[str] = []
     for name in names:
-        if name not in seen:
-            seen[name] = 1
-            result.append(name)
+        if name not in claimed:
+            unique = name
         else:
-            seen[name] += 1
-            unique = f"{name}_{seen[name]}"
-            while unique in seen:
-                seen[name] += 1
-                unique = f"{name}_{seen[name]}"
-            seen[unique] = 1
-            result.append(unique)
+            n = next_suffix.get(name, 2)
+            while f"{name}_{n}" in claimed:
+                n += 1
+            unique = f"{name}_{n}"
+            next_suffix[name] = n + 1
+        claimed.add(unique)
+        result.append(unique)
     return result
 
 
@@ -139,9 +199,114 @@ def has_geometry(obj) -> bool:
     return len(mesh.polygons) > 0 or len(mesh.edges) > 0
 
 
-def export_object_as_glb(obj, filepath: str) -> None:
+def mesh_fingerprint(mesh) -> str:
+    """
+    Return a content hash of everything the glTF exporter writes for a mesh
+    datablock.
+
+    Covers vertex positions, face and edge topology, per-face material
+    indices and smooth/flat shading, the split (per-corner) normals — which
+    carry custom normals and auto-smooth — every UV layer, every color
+    attribute and the material slot names, so two datablocks with the same
+    fingerprint export to the same GLB.  Modifiers live on the object, not
+    the mesh, and are not covered; see main().  Buffers are read with
+    foreach_get (one C call per attribute) and each segment is
+    length-prefixed so different splits can't hash alike.
+    """
+    import numpy as np  # bundled with Blender
+
+    def read(collection, attr, width, dtype):
+        buf = np.empty(len(collection) * width, dtype=dtype)
+        collection.foreach_get(attr, buf)
+        return buf
+
+    segments = [
+        read(mesh.vertices, "co", 3, np.float32),
+        read(mesh.edges, "vertices", 2, np.int32),
+        read(mesh.loops, "vertex_index", 1, np.int32),
+        read(mesh.polygons, "loop_start", 1, np.int32),
+        read(mesh.polygons, "material_index", 1, np.int32),
+        read(mesh.polygons, "use_smooth", 1, np.bool_),
+    ]
+
+    # Split normals: Blender 4.1+ exposes them as corner_normals; older
+    # versions compute them into the loops on request.
+    if hasattr(mesh, "corner_normals"):
+        segments.append(read(mesh.corner_normals, "vector", 3, np.float32))
+    else:
+        mesh.calc_normals_split()
+        segments.append(read(mesh.loops, "normal", 3, np.float32))
+
+    active_uv = mesh.uv_layers.active
+    for uv_layer in mesh.uv_layers:
+        is_active = active_uv is not None and uv_layer.name == active_uv.name
+        segments.append(f"uv:{uv_layer.name}:{is_active}".encode())
+        segments.append(read(uv_layer.data, "uv", 2, np.float32))
+
+    # Color attributes arrived in Blender 3.2; older versions only have
+    # per-corner vertex_colors layers.
+    color_attributes = getattr(mesh, "color_attributes", None)
+    if color_attributes is not None:
+        for color in color_attributes:
+            segments.append(f"color:{color.name}:{color.domain}:{color.data_type}".encode())
+            segments.append(read(color.data, "color", 4, np.float32))
+    else:
+        for color in getattr(mesh, "vertex_colors", ()):
+            segments.append(f"vcol:{color.name}".encode())
+            segments.append(read(color.data, "color", 4, np.float32))
+
+    segments.append("\0".join(m.name if m else "" for m in mesh.materials).encode())
+
+    h = hashlib.blake2b(digest_size=16)
+    for seg in segments:
+        data = seg if isinstance(seg, bytes) else seg.tobytes()
+        h.update(len(data).to_bytes(8, "little"))
+        h.update(data)
+    return h.hexdigest()
+
+
+# glTF exporter settings.  Only meshes with their UVs and materials are
+# needed; animation, morph, skin, camera, light and custom-property export
+# are switched off so the exporter skips those (historically slow) passes.
+GLTF_EXPORT_OPTIONS = {
+    "export_format": "GLB",
+    "export_animations": False,
+    "export_morph": False,
+    "export_skins": False,
+    "export_cameras": False,
+    "export_lights": False,
+    "export_extras": False,
+    "export_tangents": False,
+    "export_draco_mesh_compression_enable": False,
+}
+
+
+# Exporter settings export_object_as_glb always sets per object; these
+# can't be overridden with --gltf.
+GLTF_RESERVED_OPTIONS = frozenset({"filepath", "use_selection", "export_apply"})
+
+
+def gltf_export_kwargs(overrides: Optional[dict] = None) -> dict:
+    """
+    Return GLTF_EXPORT_OPTIONS plus overrides, keeping only the settings this
+    Blender's glTF exporter knows (names vary between exporter versions).
+    Overrides for GLTF_RESERVED_OPTIONS are dropped with a note.
+    """
+    supported = set(bpy.ops.export_scene.gltf.get_rna_type().properties.keys())
+    kwargs = {**GLTF_EXPORT_OPTIONS, **(overrides or {})}
+    for name in sorted(kwargs.keys() & GLTF_RESERVED_OPTIONS):
+        print(f"  Note: glTF setting '{name}' is set per object by this script; ignoring it")
+        del kwargs[name]
+    for name in kwargs.keys() - supported:
+        print(f"  Note: glTF exporter has no '{name}' setting; ignoring it")
+    return {name: value for name, value in kwargs.items() if name in supported}
+
+
+def export_object_as_glb(obj, filepath: str, gltf_options: Optional[dict] = None) -> int:
     """
-    Export a single object as a GLB file.
+    Export a single object as a GLB file and return its size in bytes
+    (0 if the exporter wrote nothing).  gltf_options are extra exporter
+    keyword arguments, normally from gltf_export_kwargs().
 
     Temporarily unparents the object and moves it to the world origin with
     identity rotation and unit scale so the exported GLB contains only the mesh
@@ -151,45 +316,194 @@ def export_object_as_glb(obj, filepath: str) -> None:
     parented object, Blender adjusts matrix_local to the inverse of the parent
     transform.  The glTF exporter then bakes that inverse-parent into the GLB
     node, shifting the mesh.
+
+    The restored transform is not re-evaluated here: the exporter syncs the
+    identity-pose evaluation back to the originals, so children of the
+    object keep stale matrix_world values until the caller runs
+    view_layer.update().  Callers exporting several objects update once
+    after the last export rather than once per object.  For the same reason
+    the object's own matrix_world may be stale on entry (an ancestor was
+    exported earlier), so the local state — matrix_basis, parent and
+    matrix_parent_inverse — is what gets saved and restored; none of it
+    depends on evaluation.
     """
     from mathutils import Matrix
 
-    # -- Save original state --
-    original_matrix = obj.matrix_world.copy()
+    # -- Save original state (local, so a stale matrix_world can't leak in) --
+    original_basis = obj.matrix_basis.copy()
     original_parent = obj.parent
-    original_parent_inverse = obj.matrix_parent_inverse.copy() if obj.parent else None
+    original_parent_inverse = obj.matrix_parent_inverse.copy()
 
-    # -- Clear parent (keeps world position by adjusting matrix_world) --
+    # -- Clear parent, then reset to origin (no parent to interfere) --
     if obj.parent:
-        world_copy = obj.matrix_world.copy()
         obj.parent = None
-        obj.matrix_world = world_copy
-
-    # -- Reset to origin (now safe — no parent to interfere) --
     obj.matrix_world = Matrix.Identity(4)
 
-    # Force a dependency graph update so the export picks up the new transform.
-    bpy.context.view_layer.update()
-
     # -- Select only this object --
-    bpy.ops.object.select_all(action='DESELECT')
+    # Deselect just the currently selected objects (normally only the last
+    # export) instead of running select_all over the whole scene.
+    view_layer = bpy.context.view_layer
+    for other in list(view_layer.objects.selected):
+        other.select_set(False)
     obj.select_set(True)
-    bpy.context.view_layer.objects.active = obj
+    view_layer.objects.active = obj
 
     # -- Export --
+    if gltf_options is None:
+        gltf_options = gltf_export_kwargs()
     bpy.ops.export_scene.gltf(
         filepath=filepath,
         use_selection=True,
-        export_format='GLB',
-        export_apply=True,  # bake modifiers
+        # Bake modifiers; with none there is nothing to bake, so skip the
+        # evaluated-mesh pass
+        export_apply=len(obj.modifiers) > 0,
+        **gltf_options,
     )
 
-    # -- Restore original parent and transform --
-    if original_parent:
-        obj.parent = original_parent
-        obj.matrix_parent_inverse = original_parent_inverse
-    obj.matrix_world = original_matrix
-    bpy.context.view_layer.update()
+    # -- Restore original parent and local transform --
+    obj.parent = original_parent
+    obj.matrix_parent_inverse = original_parent_inverse
+    obj.matrix_basis = original_basis
+
+    try:
+        return os.stat(filepath).st_size
+    except FileNotFoundError:
+        return 0
+
+
+def run_export_jobs(jobs: list[dict], gltf_options: dict) -> None:
+    """Export each {"object", "glb_path"} job in this Blender process (worker mode)."""
+    for i, job in enumerate(jobs, 1):
+        print(f"  [worker {os.getpid()}] {os.path.basename(job['glb_path'])} ({i}/{len(jobs)})")
+        export_object_as_glb(bpy.data.objects[job["object"]], job["glb_path"], gltf_options)
+
+
+def export_in_workers(
+    jobs: list[dict],
+    workers: int,
+    blend_path: str,
+    output_dir: str,
+    gltf_overrides: dict,
+) -> bool:
+    """
+    Export jobs across `workers` background Blender processes.
+
+    bpy is not thread-safe, so parallelism is per process: each worker opens
+    the saved .blend, exports its share of the jobs and exits.  The parent
+    only needs the files on disk — manifest transforms come from its own
+    scene.  Returns False if any worker failed.
+    """
+    # Round-robin so large and small meshes spread across workers
+    shares = [jobs[i::workers] for i in range(workers) if jobs[i::workers]]
+    script = os.path.abspath(__file__)
+    gltf_args = []
+    for name, value in gltf_overrides.items():
+        gltf_args += ["--gltf", f"{name}={json.dumps(value)}"]
+    procs = []
+    job_files = []
+    try:
+        for share in shares:
+            fd, job_path = tempfile.mkstemp(prefix="portals_export_", suffix=".json")
+            with os.fdopen(fd, "w") as f:
+                json.dump(share, f)
+            job_files.append(job_path)
+            procs.append(subprocess.Popen([
+                bpy.app.binary_path, "--background", blend_path,
+                "--python-exit-code", "1", "--python", script, "--", output_dir,
+                *gltf_args, "--export-worker", job_path,
+            ]))
+        # Wait for every worker before the job files are removed
+        exit_codes = [proc.wait() for proc in procs]
+        return all(code == 0 for code in exit_codes)
+    finally:
+        for job_path in job_files:
+            os.remove(job_path)
+
+
+# ---------------------------------------------------------------------------
+# Manifest
+# ---------------------------------------------------------------------------
+
+def glb_bboxes(objects) -> tuple[list, list]:
+    """
+    Return per-object GLB-space bounding box centers and sizes (unrounded).
+
+    The bbox is taken in Blender local space, then converted to GLB Y-up.
+    The GLB is exported at Identity, so the bbox matches the raw mesh data
+    after the glTF exporter's Z-up → Y-up conversion.  All objects are
+    reduced together as one (N, 8, 3) corner array.
+    """
+    import numpy as np  # bundled with Blender
+
+    # 8 corners in local space per object.  bound_box is stored as float32,
+    # so foreach_get copies each object's 24 floats in one C call (Blender
+    # 2.83+); older builds fall back to reading the corners one by one.
+    corners = np.empty((len(objects), 24), dtype=np.float32)
+    for row, obj in zip(corners, objects):
+        bound_box = obj.bound_box
+        if hasattr(bound_box, "foreach_get"):
+            bound_box.foreach_get(row)
+        else:
+            row[:] = [v for corner in bound_box for v in corner]
+    corners = corners.astype(np.float64).reshape(-1, 8, 3)
+    bl_min = corners.min(axis=1)
+    bl_max = corners.max(axis=1)
+
+    # Z-up → Y-up: (bx, by, bz) → (bx, bz, -by)
+    glb_min = np.column_stack((bl_min[:, 0], bl_min[:, 2], -bl_max[:, 1]))
+    glb_max = np.column_stack((bl_max[:, 0], bl_max[:, 2], -bl_min[:, 1]))
+    return ((glb_min + glb_max) / 2.0).tolist(), (glb_max - glb_min).tolist()
+
+
+def iter_manifest_entries(objects, mesh_to_glb: dict[str, str]):
+    """Yield one manifest entry per object, computed as the manifest is written."""
+    centers, sizes = glb_bboxes(objects)
+    for obj, center, size in zip(objects, centers, sizes):
+        loc, rot, scl = obj.matrix_world.decompose()
+        glb_filename = mesh_to_glb[obj.data.name]
+        # Rounded here with round() (not np.round) to keep exact 6-dp output
+        glb_center = [round(v, 6) for v in center]
+        glb_size = [round(v, 6) for v in size]
+
+        yield {
+            "name": sanitize_name(obj.name),
+            "glb_file": glb_filename,
+            "position": blender_position_to_portals(loc),
+            "rotation": blender_rotation_to_portals(rot),
+            "scale": blender_scale_to_portals(scl),
+            "glb_bbox_center": {"x": glb_center[0], "y": glb_center[1], "z": glb_center[2]},
+            "glb_bbox_size": {"x": glb_size[0], "y": glb_size[1], "z": glb_size[2]},
+        }
+
+
+def write_manifest(manifest_path: str, header: dict, entries) -> None:
+    """
+    Stream manifest.json to disk: the header keys, then an "objects" array.
+
+    Entries are encoded one at a time (one compact line each) into a 1 MiB
+    buffered file, so the full object list never exists in memory — neither
+    as dicts nor as encoded text — and large scenes cost a handful of write
+    syscalls instead of one per JSON token.  Entries are encoded with orjson
+    when it is available, otherwise with compact, UTF-8 json.dumps output.
+    """
+    if orjson is not None:
+        encode = orjson.dumps
+    else:
+        def encode(entry):
+            return json.dumps(entry, separators=(",", ":"), ensure_ascii=False).encode()
+
+    with open(manifest_path, "wb", buffering=1024 * 1024) as f:
+        # Header dict pretty-printed, minus its closing "\n}"
+        f.write(json.dumps(header, indent=2)[:-2].encode())
+        f.write(b',\n  "objects": [')
+        sep = b"\n    "
+        empty = True
+        for entry in entries:
+            f.write(sep)
+            f.write(encode(entry))
+            sep = b",\n    "
+            empty = False
+        f.write(b"]\n}\n" if empty else b"\n  ]\n}\n")
 
 
 # ---------------------------------------------------------------------------
@@ -205,9 +519,17 @@ def main() -> None:
               "--python blender_to_portals.py -- /output/dir")
         sys.exit(1)
 
-    output_dir = args[0]
+    options = parse_options(args)
+    output_dir = options["output_dir"]
     os.makedirs(output_dir, exist_ok=True)
 
+    gltf_options = gltf_export_kwargs(options["gltf"])
+
+    if options["export_worker"]:
+        with open(options["export_worker"]) as f:
+            run_export_jobs(json.load(f), gltf_options)
+        return
+
     # Determine source filename for the manifest.
     blend_path = bpy.data.filepath
     source_name = os.path.basename(blend_path) if blend_path else "unknown.blend"
@@ -218,27 +540,27 @@ def main() -> None:
         if obj.type == 'MESH' and obj.visible_get()
     ]
 
-    # Filter out degenerate meshes.
+    # Filter out degenerate meshes (reported together in one write).
     objects_to_export = []
+    skipped = []
     for obj in eligible:
         if has_geometry(obj):
             objects_to_export.append(obj)
         else:
-            print(f"  Skipping '{obj.name}' — zero-area / degenerate mesh")
+            skipped.append(f"  Skipping '{obj.name}' — zero-area / degenerate mesh")
+    if skipped:
+        print("\n".join(skipped))
 
     total = len(objects_to_export)
     print(f"Found {total} visible mesh object(s) to export from '{source_name}'.")
 
     if total == 0:
-        manifest = {
-            "source": source_name,
-            "object_count": 0,
-            "unique_meshes": 0,
-            "objects": [],
-        }
         manifest_path = os.path.join(output_dir, "manifest.json")
-        with open(manifest_path, "w") as f:
-            json.dump(manifest, f, indent=2)
+        write_manifest(
+            manifest_path,
+            {"source": source_name, "object_count": 0, "unique_meshes": 0},
+            [],
+        )
         print(f"Wrote empty manifest to {manifest_path}")
         return
 
@@ -252,111 +574,110 @@ def main() -> None:
             mesh_groups[mesh_name] = []
         mesh_groups[mesh_name].append(obj)
 
-    unique_count = len(mesh_groups)
+    # -- Merge datablocks with identical content --
+    # Fingerprinted once per datablock, not per object.  Modifiers belong to
+    # the object and are baked into the GLB (export_apply), which the mesh
+    # fingerprint can't see, so datablocks used by any object with modifiers
+    # are never merged with another datablock.
+    content_groups: dict[str, list[str]] = {}  # merge key -> [mesh.name, ...]
+    for mesh_name, objs in mesh_groups.items():
+        if any(obj.modifiers for obj in objs):
+            key = f"modified:{mesh_name}"
+        else:
+            key = mesh_fingerprint(objs[0].data)
+        content_groups.setdefault(key, []).append(mesh_name)
+
+    unique_count = len(content_groups)
     instance_count = total - unique_count
     print(f"Unique meshes: {unique_count}, instanced copies: {instance_count}")
+    merged = len(mesh_groups) - unique_count
+    if merged:
+        print(f"  ({merged} duplicate mesh datablock(s) share a GLB by content)")
 
     # -- Export one GLB per unique mesh --
     # Map mesh.name -> sanitised GLB filename
     mesh_to_glb: dict[str, str] = {}
-    glb_names_used: dict[str, int] = {}  # for deduplication of filenames
-
-    export_idx = 0
-    for mesh_name, objs in mesh_groups.items():
-        export_idx += 1
-        # Use the mesh datablock name for the GLB filename
-        safe_name = sanitize_name(mesh_name)
-
-        # Deduplicate filenames
-        if safe_name not in glb_names_used:
-            glb_names_used[safe_name] = 1
-        else:
-            glb_names_used[safe_name] += 1
-            safe_name = f"{safe_name}_{glb_names_used[safe_name]}"
-            glb_names_used[safe_name] = 1
+    # (filename, bytes) for each GLB written, recorded as it is exported
+    file_sizes: list[tuple[str, int]] = []
+    # Name each GLB after the first datablock in its group, made unique up front
+    safe_names = deduplicate_names(
+        [sanitize_name(mesh_names[0]) for mesh_names in content_groups.values()]
+    )
 
+    jobs: list[dict] = []  # JSON-safe, so they can be handed to worker processes
+    representatives = []  # the exported object for each job
+    for mesh_names, safe_name in zip(content_groups.values(), safe_names):
         glb_filename = f"{safe_name}.glb"
-        glb_path = os.path.join(output_dir, glb_filename)
-        mesh_to_glb[mesh_name] = glb_filename
-
+        for mesh_name in mesh_names:
+            mesh_to_glb[mesh_name] = glb_filename
         # Export using the first object in the group as the representative
-        representative = objs[0]
-        count_str = f" ({len(objs)} instances)" if len(objs) > 1 else ""
-        print(f"Exporting {glb_filename}{count_str} ({export_idx}/{unique_count})...")
-        export_object_as_glb(representative, glb_path)
-
-    # -- Build manifest entries for ALL objects --
-    manifest_objects: list[dict] = []
-
-    for obj in objects_to_export:
-        loc, rot, scl = obj.matrix_world.decompose()
-        glb_filename = mesh_to_glb[obj.data.name]
-
-        # Compute bounding box in Blender local space, then convert to GLB Y-up.
-        # The GLB is exported at Identity, so the bbox matches the raw mesh data
-        # after the glTF exporter's Z-up → Y-up conversion.
-        bbox = obj.bound_box  # 8 corners in local space
-        bl_min = [min(v[i] for v in bbox) for i in range(3)]
-        bl_max = [max(v[i] for v in bbox) for i in range(3)]
-
-        # Z-up → Y-up: (bx, by, bz) → (bx, bz, -by)
-        glb_min = [bl_min[0], bl_min[2], -bl_max[1]]
-        glb_max = [bl_max[0], bl_max[2], -bl_min[1]]
-        glb_center = [round((glb_min[i] + glb_max[i]) / 2.0, 6) for i in range(3)]
-        glb_size = [round(glb_max[i] - glb_min[i], 6) for i in range(3)]
-
-        manifest_objects.append({
-            "name": sanitize_name(obj.name),
+        representative = mesh_groups[mesh_names[0]][0]
+        representatives.append(representative)
+        jobs.append({
+            "object": representative.name,
             "glb_file": glb_filename,
-            "position": blender_position_to_portals(loc),
-            "rotation": blender_rotation_to_portals(rot),
-            "scale": blender_scale_to_portals(scl),
-            "glb_bbox_center": {"x": glb_center[0], "y": glb_center[1], "z": glb_center[2]},
-            "glb_bbox_size": {"x": glb_size[0], "y": glb_size[1], "z": glb_size[2]},
+            "glb_path": os.path.join(output_dir, glb_filename),
+            "instances": sum(len(mesh_groups[mesh_name]) for mesh_name in mesh_names),
         })
 
-    # -- Write manifest --
-    manifest = {
-        "source": source_name,
-        "object_count": total,
-        "unique_meshes": unique_count,
-        "objects": manifest_objects,
-    }
-
+    workers = min(options["workers"], len(jobs))
+    # Workers reopen the .blend, so it must exist and match what we see
+    if workers > 1 and blend_path and not bpy.data.is_dirty:
+        print(f"Exporting {unique_count} GLB(s) in {workers} worker processes...")
+        if not export_in_workers(jobs, workers, blend_path, output_dir, options["gltf"]):
+            print("ERROR: One or more export workers failed.")
+            sys.exit(1)
+        for job in jobs:
+            try:
+                size = os.stat(job["glb_path"]).st_size
+            except FileNotFoundError:
+                continue
+            file_sizes.append((job["glb_file"], size))
+    else:
+        if workers > 1:
+            print("Note: --workers needs a saved, unmodified .blend; exporting in-process.")
+        for export_idx, (job, representative) in enumerate(zip(jobs, representatives), 1):
+            count_str = f" ({job['instances']} instances)" if job["instances"] > 1 else ""
+            print(f"Exporting {job['glb_file']}{count_str} ({export_idx}/{unique_count})...")
+            size = export_object_as_glb(representative, job["glb_path"], gltf_options)
+            if size:
+                file_sizes.append((job["glb_file"], size))
+        # The exporter leaves children of the last representative evaluated
+        # at its identity pose; re-evaluate once so the manifest reads the
+        # restored world transforms.
+        bpy.context.view_layer.update()
+
+    # -- Write manifest, building each object's entry as it is streamed --
     manifest_path = os.path.join(output_dir, "manifest.json")
-    with open(manifest_path, "w") as f:
-        json.dump(manifest, f, indent=2)
+    write_manifest(
+        manifest_path,
+        {"source": source_name, "object_count": total, "unique_meshes": unique_count},
+        iter_manifest_entries(objects_to_export, mesh_to_glb),
+    )
 
     print(f"Done. {total} object(s), {unique_count} unique GLB(s) exported to {output_dir}")
     print(f"Manifest written to {manifest_path}")
 
     # --- Storage check on exported unique GLBs ---
-    total_bytes = 0
-    file_sizes = []
-    for glb_filename in mesh_to_glb.values():
-        glb_path = os.path.join(output_dir, glb_filename)
-        if os.path.exists(glb_path):
-            size = os.path.getsize(glb_path)
-            total_bytes += size
-            file_sizes.append((glb_filename, size))
-
+    # Built as one block and printed with a single write
+    total_bytes = sum(size for _, size in file_sizes)
     mb = total_bytes / (1024 * 1024)
-    print(f"\nUnique GLB storage: {mb:.1f} MB ({unique_count} files)")
+    report = [f"\nUnique GLB storage: {mb:.1f} MB ({unique_count} files)"]
     if total_bytes > 500 * 1024 * 1024:
-        print("CRITICAL: Over 500 MB — room may not load properly in the browser.")
-        print("  Reduce mesh complexity, combine small meshes, or remove unused objects.")
+        report.append("CRITICAL: Over 500 MB — room may not load properly in the browser.")
+        report.append("  Reduce mesh complexity, combine small meshes, or remove unused objects.")
     elif total_bytes > 200 * 1024 * 1024:
-        print("WARNING: Over 200 MB — room is heavy and may have slow load times.")
-        print("  Consider optimizing large meshes or reducing texture sizes.")
+        report.append("WARNING: Over 200 MB — room is heavy and may have slow load times.")
+        report.append("  Consider optimizing large meshes or reducing texture sizes.")
     else:
-        print("OK — within recommended size limits.")
+        report.append("OK — within recommended size limits.")
 
     # Show top 5 largest files if over warning threshold
     if total_bytes > 200 * 1024 * 1024 and file_sizes:
         file_sizes.sort(key=lambda x: x[1], reverse=True)
-        print("\nLargest GLBs:")
-        for name, size in file_sizes[:5]:
-            print(f"  {size / (1024*1024):.1f} MB  {name}")
+        report.append("\nLargest GLBs:")
+        report.extend(f"  {size / (1024*1024):.1f} MB  {name}" for name, size in file_sizes[:5])
+    print("\n".join(report))
 
 
 if __name__ == "__main__":
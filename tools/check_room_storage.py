@@ -22,6 +22,7 @@ Can also be imported as a module:
 import argparse
 import json
 import os
+import stat
 import sys
 from enum import Enum
 from pathlib import Path
@@ -65,22 +66,30 @@ def get_status(total_bytes):
 def collect_files_from_paths(paths, extensions=None):
     """
     Collect unique files from a list of paths (files or directories).
-    Returns a dict of {filename: file_path} for unique files.
+    Returns a dict of {filename: (file_path, size_bytes)} for unique files.
+
+    Directories are read with os.scandir, so file type and size come from
+    the cached DirEntry rather than separate isfile/getsize stat calls.
     """
     unique_files = {}
 
     for path in paths:
         path = os.path.abspath(path)
-        if os.path.isfile(path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        if stat.S_ISREG(st.st_mode):
             filename = os.path.basename(path)
             if extensions is None or Path(path).suffix.lower() in extensions:
-                unique_files[filename] = path
-        elif os.path.isdir(path):
-            for entry in os.listdir(path):
-                full_path = os.path.join(path, entry)
-                if os.path.isfile(full_path):
-                    if extensions is None or Path(entry).suffix.lower() in extensions:
-                        unique_files[entry] = full_path
+                unique_files[filename] = (path, st.st_size)
+        elif stat.S_ISDIR(st.st_mode):
+            with os.scandir(path) as it:
+                for entry in it:
+                    if extensions is not None and Path(entry.name).suffix.lower() not in extensions:
+                        continue
+                    if entry.is_file():
+                        unique_files[entry.name] = (entry.path, entry.stat().st_size)
     return unique_files
 
 
@@ -134,9 +143,7 @@ def check_storage(paths=None, catalog_path=None, extensions=None, quiet=False):
                     print(f"  Note: No file_size_bytes for '{filename}' in catalog")
     elif paths:
         unique_files = collect_files_from_paths(paths, extensions)
-        for filename, filepath in unique_files.items():
-            size = os.path.getsize(filepath)
-            file_details.append((filename, size))
+        file_details.extend((filename, size) for filename, (_, size) in unique_files.items())
 
     # Sort by size descending
     file_details.sort(key=lambda x: x[1], reverse=True)
@@ -161,41 +168,43 @@ def print_report(total_bytes, status, file_details, verbose=False):
         StorageStatus.CRITICAL: RED,
     }[status]
 
-    print()
-    print(f"{BOLD}{'='*60}{RESET}")
-    print(f"{BOLD}  Room Storage Check{RESET}")
-    print(f"{BOLD}{'='*60}{RESET}")
-    print()
-    print(f"  Unique files:  {len(file_details)}")
-    print(f"  Total size:    {BOLD}{format_size(total_bytes)}{RESET}")
-    print()
+    # Collected and written once instead of one print() per line
+    lines = [""]
+    lines.append(f"{BOLD}{'='*60}{RESET}")
+    lines.append(f"{BOLD}  Room Storage Check{RESET}")
+    lines.append(f"{BOLD}{'='*60}{RESET}")
+    lines.append("")
+    lines.append(f"  Unique files:  {len(file_details)}")
+    lines.append(f"  Total size:    {BOLD}{format_size(total_bytes)}{RESET}")
+    lines.append("")
 
     if status == StorageStatus.OK:
-        print(f"  {color}OK{RESET} — Room is within size limits ({format_size(total_bytes)} / 200 MB)")
+        lines.append(f"  {color}OK{RESET} — Room is within size limits ({format_size(total_bytes)} / 200 MB)")
     elif status == StorageStatus.WARNING:
-        print(f"  {color}WARNING{RESET} — Room is heavy ({format_size(total_bytes)} / 200 MB recommended)")
-        print(f"  Consider optimizing large assets to improve load times.")
+        lines.append(f"  {color}WARNING{RESET} — Room is heavy ({format_size(total_bytes)} / 200 MB recommended)")
+        lines.append(f"  Consider optimizing large assets to improve load times.")
     else:
-        print(f"  {color}CRITICAL{RESET} — Room exceeds 500 MB ({format_size(total_bytes)})")
-        print(f"  The room may fail to load in the browser. Reduce asset sizes.")
+        lines.append(f"  {color}CRITICAL{RESET} — Room exceeds 500 MB ({format_size(total_bytes)})")
+        lines.append(f"  The room may fail to load in the browser. Reduce asset sizes.")
 
     # Show top files by size
     if file_details and (verbose or status != StorageStatus.OK):
-        print()
+        lines.append("")
         show_count = min(10, len(file_details))
-        print(f"  {'Largest files:'}")
+        lines.append(f"  {'Largest files:'}")
         for filename, size in file_details[:show_count]:
             bar_pct = size / file_details[0][1] if file_details[0][1] > 0 else 0
             bar = "█" * max(1, int(bar_pct * 20))
-            print(f"    {format_size(size):>10s}  {bar}  {filename}")
+            lines.append(f"    {format_size(size):>10s}  {bar}  {filename}")
         if len(file_details) > show_count:
             remaining = len(file_details) - show_count
             remaining_size = sum(s for _, s in file_details[show_count:])
-            print(f"    {format_size(remaining_size):>10s}  ... and {remaining} more files")
+            lines.append(f"    {format_size(remaining_size):>10s}  ... and {remaining} more files")
 
-    print()
-    print(f"{BOLD}{'='*60}{RESET}")
-    print()
+    lines.append("")
+    lines.append(f"{BOLD}{'='*60}{RESET}")
+    lines.append("")
+    sys.stdout.write("\n".join(lines) + "\n")
 
     return status
 
@@ -5,7 +5,7 @@ Classify modular kit piece edges via slab-based rasterization.
 For each cardinal face (+X, -X, +Z, -Z) of a GLB mesh, this tool:
 1. Extracts a thin slab of triangles near the bounding-box face
 2. Projects those triangles onto a 2D plane (dropping the face axis)
-3. Rasterizes them into a boolean image
+3. Rasterizes them into a 0/1 coverage image
 4. Analyzes coverage in the "passage zone" (excluding floor/ceiling bands)
 5. Classifies each face as open, closed, or uncertain
 
@@ -20,10 +20,23 @@ import os
 import sys
 import json
 import argparse
+import math
+import multiprocessing
+import tempfile
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
 import numpy as np
 import trimesh
 from PIL import Image, ImageDraw
 
+try:
+    from numba import njit, prange, set_num_threads
+except ImportError:  # optional — rasterize_triangles falls back to NumPy
+    njit = None
+    prange = range
+    set_num_threads = None
+
 # ── Module constants ────────────────────────────────────────────────────────
 
 SLAB_PERCENT = 0.15
@@ -32,9 +45,14 @@ CEILING_EXCLUDE = 0.15
 OPEN_THRESHOLD = 0.20
 CLOSED_THRESHOLD = 0.70
 SIDE_EXCLUDE = 0.15    # side fraction of cell width to exclude (trim)
+NORMAL_THRESHOLD = 0.1  # min abs(normal component) for face-facing geometry
 RENDER_RES = 128
+ADAPTIVE_RES = False    # scale per-cell resolution with slab triangle count
+MIN_RENDER_RES = 32     # per-cell resolution floor when ADAPTIVE_RES is on
 EDGE_ORDER = ["+z", "+x", "-z", "-x"]
 GAMES_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "games")
+GEOMETRY_CACHE_SUFFIX = ".geomcache.npz"
+GEOMETRY_FIELDS = ("vertices", "faces", "face_normals", "triangles_center", "bounds")
 
 
 # ── 1. Mesh loading ────────────────────────────────────────────────────────
@@ -60,43 +78,98 @@ def load_mesh(glb_path):
     return trimesh.util.concatenate(meshes)
 
 
+def _load_mesh_cached(glb_path):
+    """Load the geometry classify_piece needs, cached beside the GLB.
+
+    Parsing a GLB (JSON, buffers, textures) dominates re-runs such as
+    threshold tuning, so the arrays classify_piece reads are saved to
+    {glb_path}.geomcache.npz and reused while the GLB's mtime and size
+    are unchanged. A stale, unreadable or unwritable cache just falls back
+    to load_mesh.
+
+    Args:
+        glb_path: Path to a .glb file.
+
+    Returns:
+        SimpleNamespace with vertices, faces, face_normals,
+        triangles_center and bounds arrays (the trimesh attribute names).
+
+    Raises:
+        ValueError: If no meshes are found in the GLB.
+    """
+    st = os.stat(glb_path)
+    source_stat = np.array([st.st_mtime_ns, st.st_size], dtype=np.int64)
+    cache_path = glb_path + GEOMETRY_CACHE_SUFFIX
+
+    try:
+        with np.load(cache_path, allow_pickle=False) as cached:
+            if np.array_equal(cached["source_stat"], source_stat):
+                return SimpleNamespace(**{name: cached[name] for name in GEOMETRY_FIELDS})
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+        pass
+
+    mesh = load_mesh(glb_path)
+    geometry = SimpleNamespace(**{name: np.asarray(getattr(mesh, name))
+                                  for name in GEOMETRY_FIELDS})
+
+    # Write to a uniquely named temp file and rename, so an interrupted run
+    # can't leave a truncated cache behind and two workers caching the same
+    # GLB never write into the same file
+    tmp_path = None
+    try:
+        with tempfile.NamedTemporaryFile(dir=os.path.dirname(cache_path) or ".",
+                                         prefix=os.path.basename(cache_path) + ".",
+                                         suffix=".tmp", delete=False) as f:
+            tmp_path = f.name
+            np.savez(f, source_stat=source_stat, **vars(geometry))
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        if tmp_path is not None:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+    return geometry
+
+
 # ── 2. Slab triangle filtering ─────────────────────────────────────────────
 
-def get_slab_triangles(mesh, axis, slab_min, slab_max, normal_axis=None,
-                       normal_threshold=0.1):
-    """Filter mesh triangles whose centroids fall within a slab along an axis.
+def get_slab_triangles(centroids, slab_min, slab_max, facing=None, out=None):
+    """Mask the triangles whose centroids fall within a slab along an axis.
 
     Optionally also filters by face normal direction to exclude geometry
     that is perpendicular to the face being analyzed (e.g., side walls
     that extend to the boundary but don't block the passage).
 
+    Takes per-axis columns rather than the mesh, so the two opposite faces
+    on an axis can share one centroid column and one normal test (see
+    classify_piece).
+
     Args:
-        mesh: trimesh.Trimesh object.
-        axis: 0 (X), 1 (Y), or 2 (Z) — the axis to filter along.
+        centroids: 1D array of triangle centroid coordinates along the slab
+            axis, i.e. a column of mesh.triangles_center.
         slab_min: Minimum coordinate along the axis.
         slab_max: Maximum coordinate along the axis.
-        normal_axis: If set, also filter by face normal. Only keep triangles
-            whose normal has abs(component) > normal_threshold along this axis.
-            Typically set equal to `axis` to keep only face-facing geometry.
-        normal_threshold: Minimum abs(normal component) to keep. Default 0.1.
+        facing: If set, boolean array marking triangles whose normal points
+            along the filter axis (abs(component) > NORMAL_THRESHOLD).
+            Only those are kept. Typically the slab axis, to keep only
+            face-facing geometry.
+        out: Optional preallocated boolean array of len(centroids) to write
+            the mask into, so repeated calls don't reallocate it.
 
     Returns:
-        Tuple of (vertices, filtered_faces) where vertices is mesh.vertices
-        and filtered_faces is an (N, 3) array of face indices within the slab.
-        Returns (None, None) if no triangles fall within the slab.
+        Boolean mask over the mesh triangles, True for triangles within the
+        slab. Returns None if no triangles fall within the slab.
     """
-    centroids = mesh.triangles_center
-    mask = (centroids[:, axis] >= slab_min) & (centroids[:, axis] <= slab_max)
+    mask = np.greater_equal(centroids, slab_min, out=out)
+    mask &= centroids <= slab_max
 
-    if normal_axis is not None:
-        face_normals = mesh.face_normals
-        normal_mask = np.abs(face_normals[:, normal_axis]) > normal_threshold
-        mask = mask & normal_mask
+    if facing is not None:
+        mask &= facing
 
-    filtered_faces = mesh.faces[mask]
-    if len(filtered_faces) == 0:
-        return None, None
-    return mesh.vertices, filtered_faces
+    if not mask.any():
+        return None
+    return mask
 
 
 # ── 3. 2D projection ───────────────────────────────────────────────────────
@@ -128,11 +201,75 @@ def project_to_2d(vertices, face_axis):
 
 # ── 4. Rasterization ───────────────────────────────────────────────────────
 
+def _fill_triangles(verts_u, verts_v, faces, face_ids, u_min, u_range,
+                    v_min, v_range, img):
+    """Scan-convert the faces listed in face_ids into a uint8 image.
+
+    Produces the same spans as the NumPy path in rasterize_triangles:
+    for every row a face crosses, fill between the rounded left- and
+    rightmost edge crossings. Vertices are mapped to pixels as each face
+    reads them. Compiled with numba when it is installed; faces are split
+    across cores, and concurrent writes to a shared pixel all store 1, so
+    they need no synchronisation.
+    """
+    res_v, res_u = img.shape
+    for j in prange(face_ids.shape[0]):
+        fi = face_ids[j]
+        ia = faces[fi, 0]
+        ib = faces[fi, 1]
+        ic = faces[fi, 2]
+        # Pixel corners, truncated like the NumPy path (kept as floats so
+        # the tuples stay homogeneous for numba)
+        tx = (float(math.trunc((verts_u[ia] - u_min) / u_range * (res_u - 1))),
+              float(math.trunc((verts_u[ib] - u_min) / u_range * (res_u - 1))),
+              float(math.trunc((verts_u[ic] - u_min) / u_range * (res_u - 1))))
+        ty = (float(math.trunc((1.0 - (verts_v[ia] - v_min) / v_range) * (res_v - 1))),
+              float(math.trunc((1.0 - (verts_v[ib] - v_min) / v_range) * (res_v - 1))),
+              float(math.trunc((1.0 - (verts_v[ic] - v_min) / v_range) * (res_v - 1))))
+        row_first = max(int(min(ty)), 0)
+        row_last = min(int(max(ty)), res_v - 1)
+        for row in range(row_first, row_last + 1):
+            y = float(row)
+            x_left = math.inf
+            x_right = -math.inf
+            for k in range(3):
+                x0 = tx[k]
+                x1 = tx[(k + 1) % 3]
+                y0 = ty[k]
+                y1 = ty[(k + 1) % 3]
+                if y < min(y0, y1) or y > max(y0, y1):
+                    continue
+                if y1 == y0:
+                    x_left = min(x_left, x0, x1)
+                    x_right = max(x_right, x0, x1)
+                else:
+                    x_at = x0 + (y - y0) * (x1 - x0) / (y1 - y0)
+                    x_left = min(x_left, x_at)
+                    x_right = max(x_right, x_at)
+            col_first = max(math.floor(x_left + 0.5), 0)
+            col_last = min(math.floor(x_right + 0.5), res_u - 1)
+            for col in range(col_first, col_last + 1):
+                img[row, col] = 1
+
+
+if njit is not None:
+    _fill_triangles_native = njit(cache=True, parallel=True)(_fill_triangles)
+else:
+    _fill_triangles_native = None
+
+
 def rasterize_triangles(verts_u, verts_v, faces, u_min, u_max, v_min, v_max,
-                        res_u, res_v):
-    """Rasterize projected triangles into a boolean image.
+                        res_u, res_v, face_mask=None):
+    """Rasterize projected triangles into a 0/1 uint8 image.
+
+    All triangles are scan-converted at once with NumPy: every image row a
+    triangle crosses becomes one horizontal span, bounded by where that row
+    meets the triangle's edges, and the spans are filled through a per-row
+    difference array. Vertices are snapped to whole pixels and span ends
+    are rounded, matching the PIL polygon fill this replaced to within a
+    few edge pixels. When numba is installed the same scan conversion runs
+    as a compiled per-face loop instead (see _fill_triangles).
 
-    Draws each triangle as a filled white polygon on a black image.
     V axis is flipped so that high V (ceiling) maps to row 0 (top of image)
     and low V (floor) maps to row (res_v - 1) (bottom of image).
 
@@ -144,31 +281,85 @@ def rasterize_triangles(verts_u, verts_v, faces, u_min, u_max, v_min, v_max,
         v_min, v_max: V-axis range to map into image rows.
         res_u: Image width in pixels.
         res_v: Image height in pixels.
+        face_mask: Optional boolean mask over faces selecting the triangles
+            to draw, e.g. from get_slab_triangles. Saves the caller copying
+            the selected rows out of the full face table.
 
     Returns:
-        Boolean numpy array of shape (res_v, res_u). True = geometry present.
+        uint8 numpy array of shape (res_v, res_u). 1 = geometry present.
     """
-    img = Image.new('L', (res_u, res_v), 0)
-    draw = ImageDraw.Draw(img)
-
     u_range = u_max - u_min
     v_range = v_max - v_min
 
     # Avoid division by zero
-    if u_range <= 0 or v_range <= 0:
-        return np.zeros((res_v, res_u), dtype=bool)
+    if u_range <= 0 or v_range <= 0 or len(faces) == 0:
+        return np.zeros((res_v, res_u), dtype=np.uint8)
 
-    for face in faces:
-        poly = []
-        for vi in face:
-            # Map U to pixel column [0, res_u - 1]
-            px = (verts_u[vi] - u_min) / u_range * (res_u - 1)
-            # Map V to pixel row — flip so high V -> row 0
-            py = (1.0 - (verts_v[vi] - v_min) / v_range) * (res_v - 1)
-            poly.append((px, py))
-        draw.polygon(poly, fill=255)
+    verts_u = np.asarray(verts_u)
+    verts_v = np.asarray(verts_v)
+    faces = np.asarray(faces)
 
-    return np.array(img) > 0
+    if _fill_triangles_native is not None:
+        if face_mask is None:
+            face_ids = np.arange(len(faces))
+        else:
+            face_ids = np.flatnonzero(face_mask)
+        img = np.zeros((res_v, res_u), dtype=np.uint8)
+        _fill_triangles_native(verts_u, verts_v, faces, face_ids,
+                               u_min, u_range, v_min, v_range, img)
+        return img
+
+    if face_mask is not None:
+        faces = faces[face_mask]
+
+    # Map U to pixel column [0, res_u - 1] and V to pixel row, flipped so
+    # high V -> row 0. Only the corners of the drawn faces are converted.
+    # Casting to int32 truncates, matching how ImageDraw snapped vertices,
+    # and everything up to the edge crossings stays in integer math.
+    tri_x = ((verts_u[faces] - u_min) / u_range * (res_u - 1)).astype(np.int32)
+    tri_y = ((1.0 - (verts_v[faces] - v_min) / v_range) * (res_v - 1)).astype(np.int32)
+
+    # One span per (triangle, row) pair, for rows inside the image
+    row_first = np.maximum(tri_y.min(axis=1), 0)
+    row_last = np.minimum(tri_y.max(axis=1), res_v - 1)
+    counts = np.maximum(row_last - row_first + 1, 0)
+    span_tri = np.repeat(np.arange(len(faces)), counts)
+    y = (np.arange(span_tri.size) - np.repeat(np.cumsum(counts) - counts, counts)
+         + row_first[span_tri])
+
+    # Intersect each span row with the three edges
+    x_left = np.full(y.shape, np.inf)
+    x_right = np.full(y.shape, -np.inf)
+    for a, b in ((0, 1), (1, 2), (2, 0)):
+        x0 = tri_x[span_tri, a]
+        x1 = tri_x[span_tri, b]
+        y0 = tri_y[span_tri, a]
+        y1 = tri_y[span_tri, b]
+        crosses = (y >= np.minimum(y0, y1)) & (y <= np.maximum(y0, y1))
+        dy = y1 - y0
+        flat = dy == 0
+        # Horizontal edges contribute both endpoints to the span
+        x_at = x0 + (y - y0) * (x1 - x0) / np.where(flat, 1, dy)
+        lo = np.where(flat, np.minimum(x0, x1), x_at)
+        hi = np.where(flat, np.maximum(x0, x1), x_at)
+        x_left = np.where(crosses, np.minimum(x_left, lo), x_left)
+        x_right = np.where(crosses, np.maximum(x_right, hi), x_right)
+
+    col_first = np.maximum(np.floor(x_left + 0.5), 0)
+    col_last = np.minimum(np.floor(x_right + 0.5), res_u - 1)
+    keep = col_first <= col_last
+    rows = y[keep]
+    col_first = col_first[keep].astype(np.int64)
+    col_last = col_last[keep].astype(np.int64)
+
+    # +1 where a span starts, -1 just past where it ends; a running sum
+    # along each row is then the number of spans covering each pixel.
+    stride = res_u + 1
+    size = res_v * stride
+    diff = (np.bincount(rows * stride + col_first, minlength=size)
+            - np.bincount(rows * stride + col_last + 1, minlength=size))
+    coverage = np.cumsum(diff.reshape(res_v, stride)[:, :res_u], axis=1)
+    return (coverage > 0).view(np.uint8)
 
 
 # ── 5. Coverage analysis ───────────────────────────────────────────────────
@@ -186,7 +377,7 @@ def analyze_coverage(raster, cells, floor_exclude, ceiling_exclude,
     is excluded from each side to remove door-frame/trim geometry.
 
     Args:
-        raster: Boolean array of shape (height, width).
+        raster: 0/1 uint8 (or boolean) array of shape (height, width).
         cells: Number of horizontal segments to analyze.
         floor_exclude: Fraction of image height to exclude from bottom (floor).
         ceiling_exclude: Fraction of image height to exclude from top (ceiling).
@@ -212,30 +403,34 @@ def analyze_coverage(raster, cells, floor_exclude, ceiling_exclude,
     if ph == 0 or pw == 0:
         return [0.0] * cells
 
-    coverages = []
-    for i in range(cells):
-        cell_start = int(round(i * pw / cells))
-        cell_end = int(round((i + 1) * pw / cells))
-        cell_end = max(cell_start + 1, cell_end)
-        cell_end = min(cell_end, pw)
-        cell_width = cell_end - cell_start
-
-        # Narrow within cell to exclude side trim
-        side_px = int(round(cell_width * side_exclude))
-        col_start = cell_start + side_px
-        col_end = cell_end - side_px
-        if col_start >= col_end:
-            col_start = cell_start
-            col_end = cell_end
-
-        segment = passage[:, col_start:col_end]
-        total_pixels = segment.size
-        if total_pixels == 0:
-            coverages.append(0.0)
-        else:
-            coverages.append(float(segment.sum()) / total_pixels)
-
-    return coverages
+    # One pass down the columns, then a prefix sum so each cell's pixel
+    # count is a difference of two entries. Summing bytes into int32 takes
+    # NumPy's plain integer add loop, about twice as fast as summing bools,
+    # so boolean rasters are viewed as uint8 too.
+    col_prefix = np.zeros(pw + 1, dtype=np.int64)
+    np.cumsum(passage.view(np.uint8).sum(axis=0, dtype=np.int32),
+              out=col_prefix[1:])
+
+    # Cell boundaries for all cells at once (np.rint rounds half to even,
+    # like round())
+    bounds = np.rint(np.arange(cells + 1) * pw / cells).astype(np.int64)
+    cell_starts = bounds[:-1]
+    cell_ends = np.minimum(np.maximum(bounds[1:], cell_starts + 1), pw)
+    cell_widths = cell_ends - cell_starts
+
+    # Narrow within cell to exclude side trim, unless that leaves nothing
+    side_px = np.rint(cell_widths * side_exclude).astype(np.int64)
+    col_starts = cell_starts + side_px
+    col_ends = cell_ends - side_px
+    too_narrow = col_starts >= col_ends
+    col_starts[too_narrow] = cell_starts[too_narrow]
+    col_ends[too_narrow] = cell_ends[too_narrow]
+
+    filled = col_prefix[col_ends] - col_prefix[col_starts]
+    total_pixels = ph * (col_ends - col_starts)
+    coverages = np.zeros(cells)
+    np.divide(filled, total_pixels, out=coverages, where=total_pixels > 0)
+    return coverages.tolist()
 
 
 # ── 6. Coverage classification ──────────────────────────────────────────────
@@ -301,6 +496,32 @@ def derive_piece_type(edges):
 
 # ── 8. Default rotation derivation ─────────────────────────────────────────
 
+# Canonical open/closed patterns over EDGE_ORDER = ["+z", "+x", "-z", "-x"]
+_CANONICAL_PATTERNS = {
+    "straight":    (1, 0, 1, 0),   # open +Z, -Z
+    "corner":      (1, 0, 0, 1),   # open +Z, -X
+    "t_junction":  (1, 0, 1, 1),   # open +Z, -Z, -X
+    "end_cap":     (0, 0, 1, 0),   # open -Z
+}
+
+def _build_rotation_lookup():
+    """Map piece_type -> {edge pattern: rotation steps} for every rotation.
+
+    Each canonical pattern is rotated by 0-3 steps. Symmetric patterns
+    (e.g. straight) keep the smallest step.
+    """
+    lookup = {}
+    for piece_type, canonical in _CANONICAL_PATTERNS.items():
+        rotations = lookup[piece_type] = {}
+        for rot in range(4):
+            rotated = tuple(canonical[(i - rot) % 4] for i in range(4))
+            rotations.setdefault(rotated, rot)
+    return lookup
+
+
+_ROTATION_LOOKUP = _build_rotation_lookup()
+
+
 def derive_default_rotation(edges, piece_type):
     """Derive how many 90-degree rotation steps to reach canonical orientation.
 
@@ -328,33 +549,10 @@ def derive_default_rotation(edges, piece_type):
         return 0
 
     # Build a binary pattern from EDGE_ORDER: 1 = open, 0 = closed
-    def pattern_from_edges(e):
-        return tuple(1 if e.get(face) == "open" else 0 for face in EDGE_ORDER)
-
-    actual = pattern_from_edges(edges)
-
-    # Define canonical patterns
-    canonical_patterns = {
-        # EDGE_ORDER = ["+z", "+x", "-z", "-x"]
-        "straight":    (1, 0, 1, 0),   # open +Z, -Z
-        "corner":      (1, 0, 0, 1),   # open +Z, -X
-        "t_junction":  (1, 0, 1, 1),   # open +Z, -Z, -X
-        "end_cap":     (0, 0, 1, 0),   # open -Z
-    }
-
-    canonical = canonical_patterns.get(piece_type)
-    if canonical is None:
-        return 0
-
-    # Try rotating canonical by 0-3 steps to match actual
-    for rot in range(4):
-        # Rotate canonical pattern by rot steps
-        rotated = tuple(canonical[(i - rot) % 4] for i in range(4))
-        if rotated == actual:
-            return rot
+    actual = tuple(1 if edges.get(face) == "open" else 0 for face in EDGE_ORDER)
 
-    # No match found (shouldn't happen if piece_type is correct)
-    return 0
+    # No match found (shouldn't happen if piece_type is correct) -> 0
+    return _ROTATION_LOOKUP.get(piece_type, {}).get(actual, 0)
 
 
 # ── 9. Edge simplification helper ─────────────────────────────────────────
@@ -388,19 +586,21 @@ def classify_piece(mesh, grid_size, level_height):
     rotation from the edge pattern.
 
     Args:
-        mesh: trimesh.Trimesh object.
+        mesh: trimesh.Trimesh object, or anything exposing the same
+            GEOMETRY_FIELDS arrays (e.g. from _load_mesh_cached).
         grid_size: [x, z] grid cell dimensions.
         level_height: Vertical height per level.
 
     Returns:
         Dict with "modular" key containing edges, coverage, piece_type, etc.
         Or dict with "skip": True for floor tiles (height < 0.5m).
-        Also includes "slab_rasters" key with per-face boolean arrays for diagnostics.
+        Also includes "slab_rasters" key with per-face 0/1 uint8 arrays for diagnostics.
     """
-    bounds = mesh.bounds  # [[min_x, min_y, min_z], [max_x, max_y, max_z]]
-    height = bounds[1][1] - bounds[0][1]
-    width = bounds[1][0] - bounds[0][0]
-    depth = bounds[1][2] - bounds[0][2]
+    # Unpack the bounds into plain floats once; the face loop only needs scalars
+    (min_x, min_y, min_z), (max_x, max_y, max_z) = mesh.bounds.tolist()
+    height = max_y - min_y
+    width = max_x - min_x
+    depth = max_z - min_z
 
     # Skip floor tiles (height < 0.5m)
     if height < 0.5:
@@ -410,12 +610,36 @@ def classify_piece(mesh, grid_size, level_height):
     cells_x = max(1, round(width / grid_size[0]))
     cells_z = max(1, round(depth / grid_size[1]))
 
+    # Fetch the mesh tables once for all four faces. Trimesh re-validates
+    # its cache on every property access, and np.asarray drops the tracked
+    # array subclass so later slicing doesn't pay that bookkeeping either.
+    vertices = np.asarray(mesh.vertices)
+    mesh_faces = np.asarray(mesh.faces)
+    centroids = np.asarray(mesh.triangles_center)
+    normals = np.asarray(mesh.face_normals)
+    slab_mask = np.empty(len(centroids), dtype=bool)
+
+    # Opposite faces share an axis, so each axis gets one contiguous copy of
+    # its centroid column and one face-facing normal test, reused by both
+    # faces' slab filters instead of redoing them per face.
+    axis_tables = {
+        axis: (np.ascontiguousarray(centroids[:, axis]),
+               np.abs(normals[:, axis]) > NORMAL_THRESHOLD)
+        for axis in (0, 2)
+    }
+
     edges = {}
     coverage_map = {}
     methods = {}
     slab_rasters = {}
     needs_review = False
 
+    # Per-axis extents: the slab axis itself, and the U axis of its 2D
+    # projection (Z for X faces, X for Z faces). V is always Y.
+    axis_bounds = {0: (min_x, max_x), 2: (min_z, max_z)}
+    u_bounds = {0: (min_z, max_z), 2: (min_x, max_x)}
+    v_range = max_y - min_y
+
     # Face definitions: (face_name, axis, direction, perp_cells)
     face_defs = [
         ("+x", 0, +1, cells_z),
@@ -430,18 +654,20 @@ def classify_piece(mesh, grid_size, level_height):
         slab_thickness = SLAB_PERCENT * grid_dim
 
         # Compute slab boundaries
+        axis_min, axis_max = axis_bounds[axis]
         if direction > 0:
-            slab_min = bounds[1][axis] - slab_thickness
-            slab_max = bounds[1][axis]
+            slab_min = axis_max - slab_thickness
+            slab_max = axis_max
         else:
-            slab_min = bounds[0][axis]
-            slab_max = bounds[0][axis] + slab_thickness
+            slab_min = axis_min
+            slab_max = axis_min + slab_thickness
 
         # Filter triangles in slab
-        verts, faces = get_slab_triangles(mesh, axis, slab_min, slab_max,
-                                                 normal_axis=axis)
+        axis_centroids, facing = axis_tables[axis]
+        mask = get_slab_triangles(axis_centroids, slab_min, slab_max,
+                                  facing=facing, out=slab_mask)
 
-        if verts is None:
+        if mask is None:
             # No triangles in slab -> all cells are open
             edges[face_name] = ["open"] * perp_cells
             coverage_map[face_name] = [0.0] * perp_cells
@@ -450,31 +676,30 @@ def classify_piece(mesh, grid_size, level_height):
             continue
 
         # Project to 2D
-        u_coords, v_coords = project_to_2d(verts, face_axis=axis)
+        u_coords, v_coords = project_to_2d(vertices, face_axis=axis)
 
         # Determine 2D bounds
-        if axis == 0:
-            # X face: u from Z range, v from Y range
-            u_min_val = bounds[0][2]
-            u_max_val = bounds[1][2]
-        else:
-            # Z face: u from X range, v from Y range
-            u_min_val = bounds[0][0]
-            u_max_val = bounds[1][0]
-        v_min_val = bounds[0][1]
-        v_max_val = bounds[1][1]
+        u_min_val, u_max_val = u_bounds[axis]
 
         # Compute raster resolution
-        res_u = RENDER_RES * perp_cells
-        v_range = v_max_val - v_min_val
-        res_v = max(RENDER_RES, int(RENDER_RES * v_range / grid_dim))
+        # With ADAPTIVE_RES, sparse slabs (a few large quads) get a coarser
+        # raster with far fewer pixels to fill. Coverage is a ratio so it
+        # only moves by a few percent, but that can flip faces sitting right
+        # at a threshold, hence opt-in. Slabs of 64+ triangles keep the full
+        # RENDER_RES either way.
+        cell_res = RENDER_RES
+        if ADAPTIVE_RES:
+            n_tri = int(np.count_nonzero(mask))
+            cell_res = min(RENDER_RES, max(MIN_RENDER_RES, int(math.sqrt(n_tri) * 16)))
+        res_u = cell_res * perp_cells
+        res_v = max(cell_res, int(cell_res * v_range / grid_dim))
 
         # Rasterize
         raster = rasterize_triangles(
-            u_coords, v_coords, faces,
+            u_coords, v_coords, mesh_faces,
             u_min_val, u_max_val,
-            v_min_val, v_max_val,
-            res_u, res_v
+            min_y, max_y,
+            res_u, res_v, face_mask=mask
         )
 
         slab_rasters[face_name] = raster
@@ -521,7 +746,7 @@ def save_slab_render(raster, face_name, piece_key, coverage_val, state,
     """Save a single face's slab raster as a labeled diagnostic PNG.
 
     Args:
-        raster: Boolean numpy array (res_v, res_u) or None.
+        raster: 0/1 uint8 (or boolean) numpy array (res_v, res_u) or None.
         face_name: Face identifier, e.g. "+x", "-z".
         piece_key: Catalog key for the piece (used in filename and label).
         coverage_val: Float coverage ratio for this face.
@@ -553,28 +778,20 @@ def save_slab_render(raster, face_name, piece_key, coverage_val, state,
         new_h = h * scale
 
         # Build RGB image from raster
+        filled = raster > 0
         rgb = np.zeros((h, w, 3), dtype=np.uint8)
-        rgb[raster] = [255, 255, 255]
+        rgb[filled] = [255, 255, 255]
 
         # Tint excluded floor/ceiling zones red
         ceil_row = int(round(h * CEILING_EXCLUDE))
         floor_row = int(round(h * (1.0 - FLOOR_EXCLUDE)))
 
-        # Ceiling zone (top rows)
-        for r in range(min(ceil_row, h)):
-            for c in range(w):
-                if raster[r, c]:
-                    rgb[r, c] = [255, 100, 100]  # red-tinted white
-                else:
-                    rgb[r, c] = [60, 20, 20]  # dark red
-
-        # Floor zone (bottom rows)
-        for r in range(max(floor_row, 0), h):
-            for c in range(w):
-                if raster[r, c]:
-                    rgb[r, c] = [255, 100, 100]
-                else:
-                    rgb[r, c] = [60, 20, 20]
+        for zone in (slice(0, max(ceil_row, 0)),     # ceiling zone (top rows)
+                     slice(max(floor_row, 0), h)):  # floor zone (bottom rows)
+            filled_zone = filled[zone]
+            rgb_zone = rgb[zone]
+            rgb_zone[filled_zone] = [255, 100, 100]  # red-tinted white
+            rgb_zone[~filled_zone] = [60, 20, 20]  # dark red
 
         img = Image.fromarray(rgb)
         img = img.resize((new_w, new_h), Image.NEAREST)
@@ -602,6 +819,10 @@ def generate_summary(results, thumbnail_dir, diag_dir, output_path):
     lines = ["# Edge Classification Summary\n"]
     lines.append(f"Pieces analyzed: {len(results)}\n")
 
+    # List each directory once instead of stat-ing every candidate file
+    thumb_files = set(os.listdir(thumbnail_dir)) if os.path.isdir(thumbnail_dir) else set()
+    diag_files = set(os.listdir(diag_dir)) if os.path.isdir(diag_dir) else set()
+
     skipped = {k: v for k, v in results.items() if v.get("skip")}
     classified = {k: v for k, v in results.items() if "modular" in v}
 
@@ -619,8 +840,8 @@ def generate_summary(results, thumbnail_dir, diag_dir, output_path):
         lines.append(f"### {key}\n")
 
         # Link to thumbnail if exists
-        thumb_path = os.path.join(thumbnail_dir, f"{key}.png")
-        if os.path.exists(thumb_path):
+        if f"{key}.png" in thumb_files:
+            thumb_path = os.path.join(thumbnail_dir, f"{key}.png")
             rel_thumb = os.path.relpath(thumb_path, os.path.dirname(output_path))
             lines.append(f"![thumbnail]({rel_thumb})\n")
 
@@ -648,8 +869,8 @@ def generate_summary(results, thumbnail_dir, diag_dir, output_path):
             if "uncertain" in edge_states:
                 safe_face = face.replace("+", "pos_").replace("-", "neg_")
                 diag_file = f"{key}_{safe_face}.png"
-                diag_path = os.path.join(diag_dir, diag_file)
-                if os.path.exists(diag_path):
+                if diag_file in diag_files:
+                    diag_path = os.path.join(diag_dir, diag_file)
                     rel_diag = os.path.relpath(diag_path, os.path.dirname(output_path))
                     edge_str += f" [diag]({rel_diag})"
 
@@ -669,7 +890,90 @@ def generate_summary(results, thumbnail_dir, diag_dir, output_path):
         f.write("\n".join(lines))
 
 
-# ── 13. CLI entrypoint ───────────────────────────────────────────────────
+# ── 13. Per-piece worker ─────────────────────────────────────────────────
+
+def _find_glb(glb_dir, key, item):
+    """Locate the GLB for a catalog item.
+
+    Tries the item's source_file (falling back to {key}.glb), then the
+    filename from its cdn_url, then a case-insensitive match on source_file.
+
+    Returns:
+        Path to the GLB, or None if it can't be found.
+    """
+    cdn_url = item.get("cdn_url", "")
+    # Use source_file from catalog (original filename), fall back to key
+    glb_filename = item.get("source_file", f"{key}.glb")
+    glb_path = os.path.join(glb_dir, glb_filename)
+
+    if not os.path.exists(glb_path):
+        # Try matching by original filename from URL
+        if cdn_url:
+            url_filename = cdn_url.split("/")[-1]
+            glb_path = os.path.join(glb_dir, url_filename)
+
+    if not os.path.exists(glb_path):
+        # Try case-insensitive search
+        for f in os.listdir(glb_dir):
+            if f.lower() == glb_filename.lower():
+                return os.path.join(glb_dir, f)
+        return None
+    return glb_path
+
+
+def _init_worker(slab_percent, open_threshold, closed_threshold, adaptive_res):
+    """Apply the CLI overrides in a worker process.
+
+    Workers started with the spawn method re-import this module and would
+    otherwise see the default thresholds. The pool already runs one worker
+    per core, so each worker's numba rasterizer is limited to one thread
+    rather than starting a prange team per core of its own.
+    """
+    global SLAB_PERCENT, OPEN_THRESHOLD, CLOSED_THRESHOLD, ADAPTIVE_RES
+    SLAB_PERCENT = slab_percent
+    OPEN_THRESHOLD = open_threshold
+    CLOSED_THRESHOLD = closed_threshold
+    ADAPTIVE_RES = adaptive_res
+    if set_num_threads is not None:
+        set_num_threads(1)
+
+
+def _process_piece(args):
+    """Find, load and classify one catalog item (runs in a worker process).
+
+    Args:
+        args: Tuple of (key, item, glb_dir, grid_size, level_height).
+
+    Returns:
+        Tuple of (key, found, result, error). found is False when the GLB
+        is missing. result is the classify_piece dict, keeping rasters only
+        for faces with an uncertain cell (the only ones rendered), so less
+        is sent back to the parent. error is the message if loading or
+        classification raised, else None.
+    """
+    key, item, glb_dir, grid_size, level_height = args
+
+    glb_path = _find_glb(glb_dir, key, item)
+    if glb_path is None:
+        return key, False, None, None
+
+    try:
+        mesh = _load_mesh_cached(glb_path)
+        result = classify_piece(mesh, grid_size, level_height)
+    except Exception as e:
+        return key, True, None, str(e)
+
+    if "modular" in result:
+        edges = result["modular"]["edges"]
+        result["slab_rasters"] = {
+            face_name: raster
+            for face_name, raster in result["slab_rasters"].items()
+            if "uncertain" in edges[face_name]
+        }
+    return key, True, result, None
+
+
+# ── 14. CLI entrypoint ───────────────────────────────────────────────────
 
 def main():
     """CLI entrypoint for modular edge classification.
@@ -682,8 +986,9 @@ def main():
         --slab-percent  Override SLAB_PERCENT (default: 0.15)
         --open-threshold Override OPEN_THRESHOLD (default: 0.20)
         --closed-threshold Override CLOSED_THRESHOLD (default: 0.70)
+        --adaptive-res  Lower raster resolution for slabs with few triangles
     """
-    global SLAB_PERCENT, OPEN_THRESHOLD, CLOSED_THRESHOLD
+    global SLAB_PERCENT, OPEN_THRESHOLD, CLOSED_THRESHOLD, ADAPTIVE_RES
 
     parser = argparse.ArgumentParser(
         description="Classify modular kit piece edges via slab-based rasterization."
@@ -696,12 +1001,16 @@ def main():
                         help=f"Coverage below this = open (default: {OPEN_THRESHOLD})")
     parser.add_argument("--closed-threshold", type=float, default=CLOSED_THRESHOLD,
                         help=f"Coverage above this = closed (default: {CLOSED_THRESHOLD})")
+    parser.add_argument("--adaptive-res", action="store_true",
+                        help=f"Scale raster resolution with slab triangle count, down to "
+                             f"{MIN_RENDER_RES}px per cell (faster; coverage may shift slightly)")
     args = parser.parse_args()
 
     # Apply threshold overrides
     SLAB_PERCENT = args.slab_percent
     OPEN_THRESHOLD = args.open_threshold
     CLOSED_THRESHOLD = args.closed_threshold
+    ADAPTIVE_RES = args.adaptive_res
 
     game_dir = args.game_dir
 
@@ -762,36 +1071,32 @@ def main():
     results = {}
     coverage_dist = {"open": 0, "closed": 0, "uncertain": 0}
 
-    for key, item in items.items():
-        # Find GLB file
-        cdn_url = item.get("cdn_url", "")
-        # Use source_file from catalog (original filename), fall back to key
-        glb_filename = item.get("source_file", f"{key}.glb")
-        glb_path = os.path.join(glb_dir, glb_filename)
-
-        if not os.path.exists(glb_path):
-            # Try matching by original filename from URL
-            if cdn_url:
-                url_filename = cdn_url.split("/")[-1]
-                glb_path = os.path.join(glb_dir, url_filename)
-
-        if not os.path.exists(glb_path):
-            # Try case-insensitive search
-            found = False
-            for f in os.listdir(glb_dir):
-                if f.lower() == glb_filename.lower():
-                    glb_path = os.path.join(glb_dir, f)
-                    found = True
-                    break
-            if not found:
-                print(f"  SKIP {key}: GLB not found")
-                continue
+    # PNG encoding releases the GIL, so diagnostics are written on worker
+    # threads while the next piece is classified.
+    render_pool = ThreadPoolExecutor(max_workers=os.cpu_count())
+    renders = []
+
+    piece_args = [(key, item, glb_dir, grid_size, level_height)
+                  for key, item in items.items()]
+    piece_pool = multiprocessing.Pool(
+        initializer=_init_worker,
+        initargs=(SLAB_PERCENT, OPEN_THRESHOLD, CLOSED_THRESHOLD, ADAPTIVE_RES),
+    )
+
+    # imap keeps catalog order, so the log reads the same as a serial run
+    for key, found, result, error in piece_pool.imap(_process_piece, piece_args,
+                                                     chunksize=4):
+        if not found:
+            print(f"  SKIP {key}: GLB not found")
+            continue
 
         print(f"  Processing {key}...")
+        if error is not None:
+            print(f"    ERROR: {error}")
+            continue
 
+        item = items[key]
         try:
-            mesh = load_mesh(glb_path)
-            result = classify_piece(mesh, grid_size, level_height)
             results[key] = result
 
             if result.get("skip"):
@@ -803,19 +1108,22 @@ def main():
                   f"Footprint: {mod['grid_footprint']}, "
                   f"Review: {mod['needs_review']}")
 
-            # Save diagnostic images
+            # Save diagnostic images for the faces the summary links to
             slab_rasters = result.get("slab_rasters", {})
             for face_name in EDGE_ORDER:
+                states = mod["edges"].get(face_name, ["unknown"])
+                if "uncertain" not in states:
+                    continue
                 raster = slab_rasters.get(face_name)
                 coverages = mod["coverage"].get(face_name, [0.0])
-                states = mod["edges"].get(face_name, ["unknown"])
 
                 # Use average coverage for the diagnostic label
                 avg_cov = sum(coverages) / len(coverages) if coverages else 0.0
                 primary_state = states[0] if states else "unknown"
 
-                save_slab_render(raster, face_name, key, avg_cov, primary_state,
-                                 diag_dir)
+                future = render_pool.submit(save_slab_render, raster, face_name,
+                                            key, avg_cov, primary_state, diag_dir)
+                renders.append((key, face_name, future))
 
             # Track coverage distribution
             for face_name, states in mod["edges"].items():
@@ -836,6 +1144,16 @@ def main():
             print(f"    ERROR: {e}")
             continue
 
+    piece_pool.close()
+    piece_pool.join()
+
+    # The summary checks which diagnostics exist, so let them finish first
+    render_pool.shutdown(wait=True)
+    for key, face_name, future in renders:
+        error = future.exception()
+        if error is not None:
+            print(f"  ERROR rendering {key} {face_name}: {error}")
+
     # Save updated catalog
     with open(catalog_path, 'w') as f:
         json.dump(catalog, f, indent=2)
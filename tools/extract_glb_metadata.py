@@ -15,6 +15,7 @@ import json
 import os
 import sys
 import math
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 import trimesh
 import matplotlib
@@ -24,9 +25,24 @@ from mpl_toolkits.mplot3d.art3d import Poly3DCollection
 from pathlib import Path
 from PIL import Image
 
+try:
+    from numba import njit
+except ImportError:  # optional — detect_edges falls back to NumPy
+    njit = None
+
 
 GAMES_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "games")
 
+# Thumbnails draw at most this many triangles per view
+MAX_THUMBNAIL_FACES = 5000
+
+# Thumbnails are 8x8 inches at this DPI (800x800 px)
+THUMBNAIL_DPI = 100
+
+# Below this many triangles detect_edges loops in plain Python; NumPy's
+# per-call overhead costs more than the loop (crossover measured ~32)
+SMALL_MESH_FACES = 32
+
 
 def load_glb(path):
     """Load a GLB and return a single combined trimesh."""
@@ -35,9 +51,74 @@ def load_glb(path):
     if not meshes:
         raise ValueError(f"No meshes found in {path}")
     combined = trimesh.util.concatenate(meshes)
+    # concatenate() starts with an empty cache. Fill the per-face arrays
+    # detect_edges reads now, in one pass over the triangles (all three
+    # come from the same cached triangles/cross products), so later
+    # accesses are cache hits.
+    combined.face_normals
+    combined.triangles_center
+    combined.area_faces
     return combined, scene
 
 
+def _edge_coverage(face_centroids, face_normals, face_areas, bmin, bmax,
+                   y_lo, y_hi, threshold, covered):
+    """Accumulate wall-panel area near each cardinal face in one pass.
+
+    Same tests as the NumPy path in detect_edges, applied triangle by
+    triangle; covered[0..3] receives the areas for +x, -x, +z, -z.
+    Compiled with numba when it is installed.
+    """
+    for i in range(face_centroids.shape[0]):
+        cy = face_centroids[i, 1]
+        if not (cy > y_lo and cy < y_hi):
+            continue
+        cx = face_centroids[i, 0]
+        cz = face_centroids[i, 2]
+        nx = face_normals[i, 0]
+        nz = face_normals[i, 2]
+        area = face_areas[i]
+        if abs(cx - bmax[0]) < threshold and nx > 0.3:
+            covered[0] += area
+        if abs(cx - bmin[0]) < threshold and -nx > 0.3:
+            covered[1] += area
+        if abs(cz - bmax[2]) < threshold and nz > 0.3:
+            covered[2] += area
+        if abs(cz - bmin[2]) < threshold and -nz > 0.3:
+            covered[3] += area
+
+
+def _edge_coverage_small(face_centroids, face_normals, face_areas, bmin, bmax,
+                         y_lo, y_hi, threshold):
+    """_edge_coverage over Python floats, for meshes with a few triangles.
+
+    Returns the covered areas for +x, -x, +z, -z as a list.
+    """
+    covered = [0.0, 0.0, 0.0, 0.0]
+    x_max, z_max = float(bmax[0]), float(bmax[2])
+    x_min, z_min = float(bmin[0]), float(bmin[2])
+    for (cx, cy, cz), (nx, _, nz), area in zip(face_centroids.tolist(),
+                                               face_normals.tolist(),
+                                               face_areas.tolist()):
+        if not (cy > y_lo and cy < y_hi):
+            continue
+        if abs(cx - x_max) < threshold and nx > 0.3:
+            covered[0] += area
+        if abs(cx - x_min) < threshold and -nx > 0.3:
+            covered[1] += area
+        if abs(cz - z_max) < threshold and nz > 0.3:
+            covered[2] += area
+        if abs(cz - z_min) < threshold and -nz > 0.3:
+            covered[3] += area
+    return covered
+
+
+if njit is not None:
+    _edge_coverage_native = njit(cache=True)(_edge_coverage)
+else:
+    _edge_coverage_native = None
+
+
 def detect_edges(mesh):
     """Detect which cardinal faces (±X, ±Z) are open vs closed.
 
@@ -63,14 +144,29 @@ def detect_edges(mesh):
     y_lo = bmin[1] + size[1] * 0.10
     y_hi = bmax[1] - size[1] * 0.10
 
-    # Get triangle data
-    face_normals = mesh.face_normals
-    face_centroids = mesh.triangles_center
-    face_areas = mesh.area_faces
+    # Get triangle data (plain ndarrays, so the masking below skips
+    # trimesh's tracked-array bookkeeping)
+    face_normals = np.asarray(mesh.face_normals)
+    face_centroids = np.asarray(mesh.triangles_center)
+    face_areas = np.asarray(mesh.area_faces)
 
     # Search threshold: look for wall geometry within 15% of piece size from face
     threshold = max(size[0], size[2]) * 0.15
 
+    covered = None
+    if _edge_coverage_native is not None:
+        covered = np.zeros(4)
+        _edge_coverage_native(face_centroids, face_normals, face_areas,
+                              np.asarray(bmin, dtype=np.float64),
+                              np.asarray(bmax, dtype=np.float64),
+                              y_lo, y_hi, threshold, covered)
+    elif len(face_areas) < SMALL_MESH_FACES:
+        covered = _edge_coverage_small(face_centroids, face_normals, face_areas,
+                                       bmin, bmax, y_lo, y_hi, threshold)
+    else:
+        # In the passage height band (not floor/ceiling). Same for every face.
+        in_height = (face_centroids[:, 1] > y_lo) & (face_centroids[:, 1] < y_hi)
+
     edges = {}
 
     face_configs = [
@@ -81,16 +177,17 @@ def detect_edges(mesh):
         ('-z', 2, -1, bmin[2], 0),
     ]
 
-    for name, axis, sign, face_pos, tangent in face_configs:
-        # Find triangles near this face boundary
-        near_face = np.abs(face_centroids[:, axis] - face_pos) < threshold
-        # In the passage height band (not floor/ceiling)
-        in_height = (face_centroids[:, 1] > y_lo) & (face_centroids[:, 1] < y_hi)
-        # Normal has significant component along the face direction (wall panels)
-        facing = (face_normals[:, axis] * sign) > 0.3
+    for i, (name, axis, sign, face_pos, tangent) in enumerate(face_configs):
+        if covered is not None:
+            covered_area = covered[i]
+        else:
+            # Find triangles near this face boundary, in the height band
+            mask = np.abs(face_centroids[:, axis] - face_pos) < threshold
+            mask &= in_height
+            # Normal has significant component along the face direction (wall panels)
+            mask &= (face_normals[:, axis] * sign) > 0.3
 
-        mask = near_face & in_height & facing
-        covered_area = face_areas[mask].sum()
+            covered_area = face_areas[mask].sum()
 
         # Total face area = face width × passage height
         face_width = size[tangent]
@@ -128,20 +225,22 @@ def extract_metadata(mesh):
 
     # PCA
     try:
-        vertices = mesh.vertices
-        centered = vertices - vertices.mean(axis=0)
-        cov = np.cov(centered.T)
+        vertices = np.asarray(mesh.vertices)
+        # Mean as a matrix-vector product: a column-wise mean over an
+        # (N, 3) array is a strided reduction and costs ~10x more
+        mean = np.ones(len(vertices)) @ vertices / len(vertices)
+        centered = vertices - mean
+        cov = (centered.T @ centered) / (len(centered) - 1)
         eigenvalues, eigenvectors = np.linalg.eigh(cov)
         # Sort by eigenvalue descending
         idx = np.argsort(eigenvalues)[::-1]
         eigenvalues = eigenvalues[idx]
         eigenvectors = eigenvectors[:, idx]
         pca_axes = eigenvectors.T.tolist()  # each row is an axis
-        # PCA extents: project vertices onto each axis, measure range
-        pca_extents = []
-        for axis in eigenvectors.T:
-            projections = centered @ axis
-            pca_extents.append(float(projections.max() - projections.min()))
+        # PCA extents: project vertices onto all axes at once, measure range
+        # (one row per axis, so the min/max run along contiguous memory)
+        projections = eigenvectors.T @ centered.T
+        pca_extents = (projections.max(axis=1) - projections.min(axis=1)).tolist()
     except Exception:
         pca_axes = [[1, 0, 0], [0, 1, 0], [0, 0, 1]]
         pca_extents = size
@@ -171,39 +270,28 @@ def extract_metadata(mesh):
     return result
 
 
-def render_view(ax, mesh, elevation, azimuth, title):
-    """Render a single view of the mesh onto a matplotlib axis."""
-    vertices = mesh.vertices.copy()
-    faces = mesh.faces
+def shade_faces(verts_for_faces):
+    """Flat-shade triangles given as an (M, 3, 3) vertex array.
 
-    # Convert GLB Y-up to matplotlib Z-up via +90° rotation around X-axis.
-    # This preserves handedness (right-handed → right-handed), unlike a
-    # simple Y↔Z column swap which mirrors horizontally.
-    # Mapping: (x, y, z)_glb → (x, -z, y)_mpl
-    new_y = -vertices[:, 2].copy()
-    new_z = vertices[:, 1].copy()
-    vertices[:, 1] = new_y
-    vertices[:, 2] = new_z
-
-    # Subsample faces if too many (for rendering speed)
-    max_faces = 5000
-    if len(faces) > max_faces:
-        indices = np.random.choice(len(faces), max_faces, replace=False)
-        faces_subset = faces[indices]
-    else:
-        faces_subset = faces
-
-    # Create polygon collection
-    verts_for_faces = vertices[faces_subset]
-
-    # Simple shading based on face normals
-    face_normals = np.cross(
-        verts_for_faces[:, 1] - verts_for_faces[:, 0],
-        verts_for_faces[:, 2] - verts_for_faces[:, 0]
-    )
-    norms = np.linalg.norm(face_normals, axis=1, keepdims=True)
+    Returns an (M, 4) RGBA array lit from the upper-right-front.
+    """
+    # Simple shading based on face normals. Edges, the cross product and
+    # the normalisation all write into preallocated buffers.
+    n_faces = len(verts_for_faces)
+    edge1 = np.empty((n_faces, 3))
+    edge2 = np.empty((n_faces, 3))
+    face_normals = np.empty((n_faces, 3))
+    scratch = np.empty(n_faces)
+    np.subtract(verts_for_faces[:, 1], verts_for_faces[:, 0], out=edge1)
+    np.subtract(verts_for_faces[:, 2], verts_for_faces[:, 0], out=edge2)
+    for i, j, k in ((0, 1, 2), (1, 2, 0), (2, 0, 1)):
+        np.multiply(edge1[:, j], edge2[:, k], out=face_normals[:, i])
+        np.multiply(edge1[:, k], edge2[:, j], out=scratch)
+        face_normals[:, i] -= scratch
+    norms = np.einsum('ij,ij->i', face_normals, face_normals, out=scratch)
+    np.sqrt(norms, out=norms)
     norms[norms == 0] = 1
-    face_normals = face_normals / norms
+    face_normals /= norms[:, None]
 
     # Light from upper-right-front
     light_dir = np.array([0.5, 0.8, 0.6])
@@ -211,21 +299,23 @@ def render_view(ax, mesh, elevation, azimuth, title):
     intensity = np.abs(face_normals @ light_dir)
     intensity = 0.3 + 0.7 * intensity  # ambient + diffuse
 
-    colors = np.zeros((len(faces_subset), 4))
-    colors[:, 0] = 0.55 * intensity  # R
-    colors[:, 1] = 0.65 * intensity  # G
-    colors[:, 2] = 0.75 * intensity  # B
+    # float32 RGBA: matplotlib only needs 8-bit precision per channel
+    colors = np.empty((n_faces, 4), dtype=np.float32)
+    colors[:, :3] = intensity[:, None] * np.array([0.55, 0.65, 0.75])  # R, G, B
     colors[:, 3] = 1.0
+    return colors
 
+
+def render_view(ax, verts_for_faces, colors, center, extent,
+                elevation, azimuth, title):
+    """Render a single view of the mesh onto a matplotlib axis.
+
+    verts_for_faces, colors, center and extent are computed once per mesh
+    by render_thumbnail and shared by every view.
+    """
     collection = Poly3DCollection(verts_for_faces, facecolors=colors, edgecolors='none', linewidths=0)
     ax.add_collection3d(collection)
 
-    # Set view — after the +90° X rotation, vertex coords are in matplotlib's
-    # Z-up convention with preserved handedness.
-    bounds_swapped = vertices.min(axis=0), vertices.max(axis=0)
-    center = (bounds_swapped[0] + bounds_swapped[1]) / 2
-    extent = (bounds_swapped[1] - bounds_swapped[0]).max() * 0.65
-
     ax.set_xlim(center[0] - extent, center[0] + extent)
     ax.set_ylim(center[1] - extent, center[1] + extent)
     ax.set_zlim(center[2] - extent, center[2] + extent)
@@ -237,7 +327,7 @@ def render_view(ax, mesh, elevation, azimuth, title):
 
 def render_thumbnail(mesh, output_path):
     """Render a 2x2 multi-view composite thumbnail."""
-    fig = plt.figure(figsize=(8, 8), facecolor='#1a1a2e')
+    fig = plt.figure(figsize=(8, 8), dpi=THUMBNAIL_DPI, facecolor='#1a1a2e')
 
     # Camera angles calibrated for the (x, -z, y) coordinate transform.
     # After transform: mpl_x = GLB_x, mpl_y = -GLB_z, mpl_z = GLB_y
@@ -252,13 +342,42 @@ def render_thumbnail(mesh, output_path):
         (25, 45, "Perspective"),
     ]
 
+    # Convert GLB Y-up to matplotlib Z-up via +90° rotation around X-axis.
+    # This preserves handedness (right-handed → right-handed), unlike a
+    # simple Y↔Z column swap which mirrors horizontally.
+    # Mapping: (x, y, z)_glb → (x, -z, y)_mpl
+    vertices = np.asarray(mesh.vertices)[:, [0, 2, 1]]
+    vertices[:, 1] *= -1
+
+    # Subsample faces if too many (for rendering speed). Evenly strided
+    # rather than random, so thumbnails are reproducible, and picked once
+    # for all four views.
+    faces = mesh.faces
+    if len(faces) > MAX_THUMBNAIL_FACES:
+        indices = np.linspace(0, len(faces) - 1, MAX_THUMBNAIL_FACES).astype(np.int64)
+        faces_subset = faces[indices]
+    else:
+        faces_subset = faces
+
+    verts_for_faces = vertices[faces_subset]
+    colors = shade_faces(verts_for_faces)
+
+    # View limits — after the +90° X rotation, vertex coords are in
+    # matplotlib's Z-up convention with preserved handedness.
+    lo = vertices.min(axis=0)
+    hi = vertices.max(axis=0)
+    center = (lo + hi) / 2
+    extent = (hi - lo).max() * 0.65
+
     for i, (elev, azim, title) in enumerate(views):
         ax = fig.add_subplot(2, 2, i + 1, projection='3d', facecolor='#1a1a2e')
         ax.title.set_color('white')
-        render_view(ax, mesh, elev, azim, title)
+        render_view(ax, verts_for_faces, colors, center, extent, elev, azim, title)
 
-    plt.tight_layout(pad=1.0)
-    plt.savefig(output_path, dpi=150, bbox_inches='tight', facecolor='#1a1a2e')
+    # Fixed margins instead of tight_layout/bbox_inches='tight', which each
+    # cost an extra full draw of all four 3D views; the figure renders once.
+    fig.subplots_adjust(left=0, right=1, bottom=0, top=0.97, wspace=0.02, hspace=0.06)
+    fig.savefig(output_path, dpi=THUMBNAIL_DPI, facecolor='#1a1a2e')
     plt.close(fig)
 
 
@@ -278,8 +397,6 @@ def process_glb(glb_path, thumbnail_dir, cdn_url=""):
     filename = os.path.basename(glb_path)
     key = slugify(filename)
 
-    print(f"  Processing: {filename} -> {key}")
-
     # Track file size
     file_size_bytes = os.path.getsize(glb_path)
 
@@ -290,7 +407,6 @@ def process_glb(glb_path, thumbnail_dir, cdn_url=""):
     # Render thumbnail
     thumb_path = os.path.join(thumbnail_dir, f"{key}.png")
     render_thumbnail(mesh, thumb_path)
-    print(f"    Thumbnail: {thumb_path}")
 
     # Build catalog entry
     entry = {
@@ -306,6 +422,24 @@ def process_glb(glb_path, thumbnail_dir, cdn_url=""):
     return key, entry
 
 
+def _process_glb_job(args):
+    """Run process_glb in a worker process.
+
+    Args:
+        args: Tuple of (glb_path, thumbnail_dir, cdn_url).
+
+    Returns:
+        Tuple of (entry, error). entry is the catalog entry, or None if
+        processing raised, in which case error is the message.
+    """
+    glb_path, thumbnail_dir, cdn_url = args
+    try:
+        _, entry = process_glb(glb_path, thumbnail_dir, cdn_url)
+    except Exception as e:
+        return None, str(e)
+    return entry, None
+
+
 def main():
     parser = argparse.ArgumentParser(description="Extract GLB metadata and thumbnails for Portals catalog")
     parser.add_argument("input", help="Path to a GLB file or folder of GLBs")
@@ -350,13 +484,25 @@ def main():
     print(f"Output: {room_dir}")
     print()
 
-    for glb_path in glb_files:
-        filename = os.path.basename(glb_path)
-        cdn_url = cdn_urls.get(filename, "")
+    # Each GLB is independent, so files are processed in worker processes.
+    # map() keeps file order, so the log and catalog read the same as a
+    # serial run.
+    jobs = [(glb_path, thumbnail_dir, cdn_urls.get(os.path.basename(glb_path), ""))
+            for glb_path in glb_files]
+    max_workers = max(1, min(os.cpu_count() or 1, len(jobs)))
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        for glb_path, (entry, error) in zip(glb_files, pool.map(_process_glb_job, jobs)):
+            filename = os.path.basename(glb_path)
+            key = slugify(filename)
+            print(f"  Processing: {filename} -> {key}")
+
+            if error is not None:
+                print(f"    ERROR: {error}")
+                print()
+                continue
 
-        try:
-            key, entry = process_glb(glb_path, thumbnail_dir, cdn_url)
             catalog["items"][key] = entry
+            print(f"    Thumbnail: {os.path.join(thumbnail_dir, f'{key}.png')}")
             print(f"    Size: {entry['size']}, Triangles: {entry['triangles']}")
             if 'edges' in entry:
                 edge_summary = ', '.join(
@@ -365,9 +511,6 @@ def main():
                 )
                 print(f"    Edges: {edge_summary}")
             print()
-        except Exception as e:
-            print(f"    ERROR: {e}")
-            print()
 
     # Save catalog
     with open(catalog_path, 'w') as f:
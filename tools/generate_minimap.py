@@ -14,18 +14,27 @@ import json
 import sys
 import os
 import math
+import itertools
+
+import numpy as np
 
 try:
     import matplotlib
     matplotlib.use('Agg')
     import matplotlib.pyplot as plt
-    import matplotlib.patches as patches
-    import matplotlib.transforms as transforms
+    import matplotlib.collections as collections
 except ImportError:
     print("ERROR: matplotlib is required. Install with: pip install matplotlib")
     sys.exit(1)
 
 
+# Unit-cube corners (±1 on each axis), scaled by half-extents per cube
+CORNERS = np.array(list(itertools.product((-1, 1), repeat=3)), dtype=np.float64)
+
+# Unit-square corners for the 2D footprint rectangles
+RECT_CORNERS = np.array([[-1, -1], [1, -1], [1, 1], [-1, 1]], dtype=np.float64)
+
+
 def quat_to_yaw(rot):
     """Extract Y-axis rotation (yaw) from quaternion {x, y, z, w}."""
     x = rot.get('x', 0)
@@ -37,6 +46,18 @@ def quat_to_yaw(rot):
     return math.atan2(siny_cosp, cosy_cosp)
 
 
+def quat_to_matrix(qx, qy, qz, qw):
+    """Rotation matrix for quaternion components (scalars or 1D arrays).
+
+    Returns shape (3, 3) for scalars, (N, 3, 3) for arrays of length N.
+    """
+    return np.stack([
+        np.stack([1 - 2 * (qy * qy + qz * qz), 2 * (qx * qy - qz * qw), 2 * (qx * qz + qy * qw)], axis=-1),
+        np.stack([2 * (qx * qy + qz * qw), 1 - 2 * (qx * qx + qz * qz), 2 * (qy * qz - qx * qw)], axis=-1),
+        np.stack([2 * (qx * qz - qy * qw), 2 * (qy * qz + qx * qw), 1 - 2 * (qx * qx + qy * qy)], axis=-1),
+    ], axis=-2)
+
+
 def rotated_footprint(scale, rot):
     """Compute X-Z footprint and Y height of a cube after full 3D rotation.
 
@@ -57,28 +78,46 @@ def rotated_footprint(scale, rot):
         return sx, sz, quat_to_yaw(rot), sy
 
     # Full rotation: rotate 8 corners and compute AABB on all axes
-    hx, hy, hz = sx / 2, sy / 2, sz / 2
-    min_x = min_y = min_z = float('inf')
-    max_x = max_y = max_z = float('-inf')
-    for dx in (-1, 1):
-        for dy in (-1, 1):
-            for dz in (-1, 1):
-                vx, vy, vz = dx * hx, dy * hy, dz * hz
-                # q * v * q^-1 via rodrigues
-                tx = 2 * (qy * vz - qz * vy)
-                ty = 2 * (qz * vx - qx * vz)
-                tz = 2 * (qx * vy - qy * vx)
-                rx = vx + qw * tx + (qy * tz - qz * ty)
-                ry = vy + qw * ty + (qz * tx - qx * tz)
-                rz = vz + qw * tz + (qx * ty - qy * tx)
-                min_x = min(min_x, rx)
-                max_x = max(max_x, rx)
-                min_y = min(min_y, ry)
-                max_y = max(max_y, ry)
-                min_z = min(min_z, rz)
-                max_z = max(max_z, rz)
-
-    return max_x - min_x, max_z - min_z, 0, max_y - min_y
+    R = quat_to_matrix(qx, qy, qz, qw)
+    rotated = (CORNERS * (0.5 * np.array([sx, sy, sz]))) @ R.T
+    mn = rotated.min(axis=0)
+    mx = rotated.max(axis=0)
+
+    return float(mx[0] - mn[0]), float(mx[2] - mn[2]), 0, float(mx[1] - mn[1])
+
+
+def rotated_footprints(scales, rots):
+    """Batched rotated_footprint over N cubes.
+
+    Args:
+        scales: (N, 3) array of cube scales (x, y, z).
+        rots: (N, 4) array of quaternions (x, y, z, w).
+
+    Returns (width, depth, yaw, y_height), each an (N,) array.
+    """
+    qx, qy, qz, qw = rots.T
+    width = scales[:, 0].copy()
+    depth = scales[:, 2].copy()
+    y_height = scales[:, 1].copy()
+    yaw = np.zeros(len(rots))
+
+    # Fast path: Y-only rotation (no X/Z tilt) — most cubes
+    flat = (np.abs(qx) < 0.001) & (np.abs(qz) < 0.001)
+    yaw[flat] = np.arctan2(2 * (qw[flat] * qy[flat] + qx[flat] * qz[flat]),
+                           1 - 2 * (qy[flat] * qy[flat] + qz[flat] * qz[flat]))
+
+    # Full rotation: rotate 8 corners of every tilted cube and take AABBs
+    tilted = ~flat
+    if tilted.any():
+        R = quat_to_matrix(qx[tilted], qy[tilted], qz[tilted], qw[tilted])
+        corners = CORNERS * (0.5 * scales[tilted])[:, None, :]
+        rotated = corners @ R.transpose(0, 2, 1)
+        extents = rotated.max(axis=1) - rotated.min(axis=1)
+        width[tilted] = extents[:, 0]
+        depth[tilted] = extents[:, 2]
+        y_height[tilted] = extents[:, 1]
+
+    return width, depth, yaw, y_height
 
 
 def load_snapshot(path):
@@ -88,63 +127,86 @@ def load_snapshot(path):
 
 
 def extract_footprints(items):
-    """Extract 2D footprints (top-down rectangles) from room items."""
-    footprints = []
-    for item_id, item in items.items():
+    """Extract 2D footprints (top-down rectangles) from room items.
+
+    Items are read in one pass; the rotated extents and yaws of all cubes
+    and triggers are then computed together with rotated_footprints.
+    """
+    kinds = []
+    positions = []
+    sizes = []
+    rotated_idx = []
+    rotated_scales = []
+    rotated_rots = []
+    for item in items.values():
         prefab = item.get('prefabName', '')
         pos = item.get('pos', {})
-        scale = item.get('scale', {})
-        rot = item.get('rot', {})
-        px = pos.get('x', 0)
         py = pos.get('y', 0)
-        pz = pos.get('z', 0)
-        sx = scale.get('x', 1)
-        sz = scale.get('z', 1)
 
         # Skip items far below ground — hidden/utility items
         if py < -2:
             continue
 
-        if prefab == 'ResizableCube':
-            w, d, yaw, y_height = rotated_footprint(scale, rot)
-            # Thin cubes after rotation are floors/ceilings — render subtly
-            cube_type = 'floor' if y_height < 0.5 else 'cube'
-            footprints.append({
-                'x': px, 'z': pz,
-                'w': w, 'd': d,
-                'yaw': yaw,
-                'type': cube_type
-            })
+        scale = item.get('scale', {})
+        if prefab == 'ResizableCube' or prefab == 'Trigger':
+            rot = item.get('rot', {})
+            rotated_idx.append(len(kinds))
+            rotated_scales.append((scale.get('x', 1), scale.get('y', 1), scale.get('z', 1)))
+            rotated_rots.append((rot.get('x', 0), rot.get('y', 0), rot.get('z', 0), rot.get('w', 1)))
+            kind = 'trigger' if prefab == 'Trigger' else 'cube'
+            w = d = 0
         elif prefab in ('GLB', 'GlbCollectable', 'Destructible'):
-            footprints.append({
-                'x': px, 'z': pz,
-                'w': sx * 0.5, 'd': sz * 0.5,
-                'yaw': 0,
-                'type': 'glb'
-            })
+            kind = 'glb'
+            w, d = scale.get('x', 1) * 0.5, scale.get('z', 1) * 0.5
         elif prefab in ('GLBNPC', 'EnemyNPC'):
-            footprints.append({
-                'x': px, 'z': pz,
-                'w': 0.4, 'd': 0.4,
-                'yaw': 0,
-                'type': 'npc'
-            })
+            kind = 'npc'
+            w = d = 0.4
         elif prefab == 'SpawnPoint':
-            footprints.append({
-                'x': px, 'z': pz,
-                'w': 0.3, 'd': 0.3,
-                'yaw': 0,
-                'type': 'spawn'
-            })
-        elif prefab == 'Trigger':
-            w, d, yaw, _ = rotated_footprint(scale, rot)
-            footprints.append({
-                'x': px, 'z': pz,
-                'w': w, 'd': d,
-                'yaw': yaw,
-                'type': 'trigger'
-            })
-    return footprints
+            kind = 'spawn'
+            w = d = 0.3
+        else:
+            continue
+        kinds.append(kind)
+        positions.append((pos.get('x', 0), pos.get('z', 0)))
+        sizes.append([w, d, 0])
+
+    if rotated_idx:
+        w, d, yaw, y_height = rotated_footprints(
+            np.array(rotated_scales, dtype=np.float64),
+            np.array(rotated_rots, dtype=np.float64))
+        for i, row_w, row_d, row_yaw, row_h in zip(
+                rotated_idx, w.tolist(), d.tolist(), yaw.tolist(), y_height.tolist()):
+            sizes[i] = [row_w, row_d, row_yaw]
+            # Thin cubes after rotation are floors/ceilings — render subtly
+            if kinds[i] == 'cube' and row_h < 0.5:
+                kinds[i] = 'floor'
+
+    return [
+        {'x': px, 'z': pz, 'w': w, 'd': d, 'yaw': yaw, 'type': kind}
+        for kind, (px, pz), (w, d, yaw) in zip(kinds, positions, sizes)
+    ]
+
+
+def footprint_polygons(footprints, pad=0.02):
+    """Corner coordinates of rotated footprint rectangles, shape (N, 4, 2).
+
+    Each rectangle is grown by pad on every side (the margin the rounded
+    box style used to add) and rotated by -yaw about its center.
+    """
+    fp_x = np.array([fp['x'] for fp in footprints], dtype=np.float64)
+    fp_z = np.array([fp['z'] for fp in footprints], dtype=np.float64)
+    half_w = np.array([fp['w'] for fp in footprints], dtype=np.float64) / 2 + pad
+    half_d = np.array([fp['d'] for fp in footprints], dtype=np.float64) / 2 + pad
+    angle = -np.array([fp['yaw'] for fp in footprints], dtype=np.float64)
+
+    # Local corners, counter-clockwise from bottom-left
+    local = RECT_CORNERS * np.stack([half_w, half_d], axis=-1)[:, None, :]
+    cos = np.cos(angle)[:, None]
+    sin = np.sin(angle)[:, None]
+    polys = np.empty_like(local)
+    polys[..., 0] = local[..., 0] * cos - local[..., 1] * sin + fp_x[:, None]
+    polys[..., 1] = local[..., 0] * sin + local[..., 1] * cos + fp_z[:, None]
+    return polys
 
 
 def render_minimap(footprints, output_path, dpi=150):
@@ -186,43 +248,33 @@ def render_minimap(footprints, output_path, dpi=150):
         'trigger': '#ff6b6b44',
     }
 
-    # Draw floors first (zorder=0) so walls/objects render on top
-    sorted_fps = sorted(footprints, key=lambda f: 0 if f['type'] == 'floor' else 1)
-
-    for fp in sorted_fps:
-        color = colors.get(fp['type'], '#333')
-        if fp['type'] in ('spawn', 'npc'):
-            ax.plot(fp['x'], fp['z'], 'o', color=color, markersize=6, zorder=3)
-        elif fp['type'] == 'floor':
-            rect = patches.FancyBboxPatch(
-                (fp['x'] - fp['w'] / 2, fp['z'] - fp['d'] / 2),
-                fp['w'], fp['d'],
-                boxstyle="round,pad=0.02",
-                facecolor='#1a2030',
-                edgecolor='#2a3a4a55',
-                linewidth=0.5,
-                zorder=0
-            )
-            t = transforms.Affine2D().rotate_around(
-                fp['x'], fp['z'], -fp['yaw']
-            ) + ax.transData
-            rect.set_transform(t)
-            ax.add_patch(rect)
-        else:
-            rect = patches.FancyBboxPatch(
-                (fp['x'] - fp['w'] / 2, fp['z'] - fp['d'] / 2),
-                fp['w'], fp['d'],
-                boxstyle="round,pad=0.02",
-                facecolor=color,
-                edgecolor='#4a5a6a33',
-                linewidth=0.5,
-                zorder=1
-            )
-            t = transforms.Affine2D().rotate_around(
-                fp['x'], fp['z'], -fp['yaw']
-            ) + ax.transData
-            rect.set_transform(t)
-            ax.add_patch(rect)
+    # Draw floors first (zorder=0) so walls/objects render on top. Each
+    # layer is one PolyCollection; within a layer footprints keep their
+    # snapshot order.
+    floors = [fp for fp in footprints if fp['type'] == 'floor']
+    blocks = [fp for fp in footprints if fp['type'] not in ('floor', 'spawn', 'npc')]
+    if floors:
+        ax.add_collection(collections.PolyCollection(
+            footprint_polygons(floors),
+            facecolors='#1a2030',
+            edgecolors='#2a3a4a55',
+            linewidths=0.5,
+            zorder=0
+        ))
+    if blocks:
+        ax.add_collection(collections.PolyCollection(
+            footprint_polygons(blocks),
+            facecolors=[colors.get(fp['type'], '#333') for fp in blocks],
+            edgecolors='#4a5a6a33',
+            linewidths=0.5,
+            zorder=1
+        ))
+
+    for marker_type in ('npc', 'spawn'):
+        markers = [fp for fp in footprints if fp['type'] == marker_type]
+        if markers:
+            ax.plot([fp['x'] for fp in markers], [fp['z'] for fp in markers], 'o',
+                    color=colors[marker_type], markersize=6, zorder=3)
 
     # Grid — X horizontal (left/right), Z vertical (+Z = forward = up on map)
     # matplotlib default: y increases upward → z_max at top of plot → top of saved PNG